@@ -1,15 +1,39 @@
 import re
 from collections import defaultdict
+from functools import lru_cache
 
 from .settings import ALT_VALIDATION_FIELDS, VALIDATION_FIELD
-from .utils import unlist
+from .utils import str2list, unlist
+
+REGEX_URL = re.compile(
+    r"^(?:http|ftp)s?://"  # http:// or https://
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"  # domain...
+    r"localhost|"  # localhost...
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
+    r"(?::\d+)?"  # optional port
+    r"(?:/?|[/?]\S+)$",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=65536)
+def determine_id_type(_id):
+    """Determine whether an ID is a curie or URI or none of them
+    The result only depends on the ID itself, so it's memoized across all converters.
+    """
+    if REGEX_URL.match(_id):
+        return "url"
+    elif len(_id.split(":")) == 2 and isinstance(_id.split(":")[0], str):
+        return "curie"
+    else:
+        return "name"
 
 
 class CurieUriConverter:
     """Converte between Curies, URIs and names"""
 
     def __init__(self, context, uri_list=None):
-        self.context = context
+        self.update_context(context)
         self.uri_list = uri_list or []
         # map URI to its corresponding names
         self.name_dict = defaultdict(list)
@@ -17,23 +41,36 @@ class CurieUriConverter:
             _name = self.get_label(_uri)
             self.name_dict[_name].append(_uri)
 
+    def update_context(self, context):
+        """Set the context and rebuild the namespace -> prefix index
+        It should be called again if the context is modified in place.
+        """
+        self.context = context
+        # if several prefixes share the same namespace, the last one wins
+        self.prefix_dict = {
+            namespace: prefix
+            for prefix, namespace in context.items()
+            if prefix and isinstance(namespace, str)
+        }
+
     def determine_id_type(self, _id):
         """Determine whether an ID is a curie or URI or none of them"""
-        regex_url = re.compile(
-            r"^(?:http|ftp)s?://"  # http:// or https://
-            r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"  # domain...
-            r"localhost|"  # localhost...
-            r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
-            r"(?::\d+)?"  # optional port
-            r"(?:/?|[/?]\S+)$",
-            re.IGNORECASE,
-        )
-        if re.match(regex_url, _id):
-            return "url"
-        elif len(_id.split(":")) == 2 and isinstance(_id.split(":")[0], str):
-            return "curie"
-        else:
-            return "name"
+        return determine_id_type(_id)
+
+    def match_namespace(self, uri):
+        """Return a (prefix, name) tuple of the namespace matching the URI, or None
+        The namespace ending at the last "/" is tried first, then the longest
+        namespace ending after it, e.g. "http://www.w3.org/2000/01/rdf-schema#"
+        """
+        namespace, name = uri.rsplit("/", 1)
+        prefix = self.prefix_dict.get(namespace + "/")
+        if prefix:
+            return prefix, name
+        for idx in range(len(uri) - 1, len(namespace) + 1, -1):
+            prefix = self.prefix_dict.get(uri[:idx])
+            if prefix:
+                return prefix, uri[idx:]
+        return None
 
     def get_uri(self, _input):
         """Convert input to URI format"""
@@ -47,7 +84,8 @@ class CurieUriConverter:
             prefix, suffix = _input.split(":")
             if prefix in self.context:
                 namespace_url = self.context[prefix]
-                if not namespace_url.endswith("/"):
+                # e.g. "http://www.w3.org/2000/01/rdf-schema#" is used as is
+                if not namespace_url.endswith(("/", "#")):
                     namespace_url += "/"
                 return namespace_url + suffix
             else:
@@ -68,14 +106,9 @@ class CurieUriConverter:
             return _input
         # if input type is URI, try convert to CUIRE, if not, return URI
         elif _type == "url":
-            uri, name = _input.rsplit("/", 1)
-            uri += "/"
-            prefix = None
-            for k, v in self.context.items():
-                if v == uri:
-                    prefix = k
-            if prefix:
-                return prefix + ":" + name
+            matched = self.match_namespace(_input)
+            if matched:
+                return matched[0] + ":" + matched[1]
             else:
                 return _input
         else:
@@ -97,14 +130,9 @@ class CurieUriConverter:
             return _input.split(":")[0]
         # if input type is URI, try convert to CUIRE, if not, return URI
         elif _type == "url":
-            uri = _input.rsplit("/", 1)[0]
-            uri += "/"
-            prefix = None
-            for k, v in self.context.items():
-                if v == uri:
-                    prefix = k
-            if prefix:
-                return prefix
+            matched = self.match_namespace(_input)
+            if matched:
+                return matched[0]
             else:
                 return None
         else:
@@ -117,6 +145,29 @@ class CurieUriConverter:
             else:
                 return None
 
+    @staticmethod
+    def _convert_all(convert, inputs):
+        """Convert each distinct item of inputs only once, return the results in input order"""
+        inputs = list(inputs)
+        converted = {_input: convert(_input) for _input in dict.fromkeys(inputs)}
+        return [converted[_input] for _input in inputs]
+
+    def get_uris(self, inputs):
+        """Convert a list of inputs to URI format"""
+        return self._convert_all(self.get_uri, inputs)
+
+    def get_curies(self, inputs):
+        """Convert a list of inputs to CURIE format"""
+        return self._convert_all(self.get_curie, inputs)
+
+    def get_prefixes(self, inputs):
+        """Get the prefixes from a list of inputs"""
+        return self._convert_all(self.get_prefix, inputs)
+
+    def get_labels(self, inputs):
+        """Convert a list of inputs to labels"""
+        return self._convert_all(self.get_label, inputs)
+
     def get_label(self, _input):
         """Convert input to CURIE format
         TODO: URL could contain #
@@ -131,6 +182,50 @@ class CurieUriConverter:
             return _input.split(":")[-1]
 
 
+class UriTable:
+    """A table of the canonical string objects of URIs
+
+    intern returns the canonical string object of a URI, so the structures built
+    from the same schema (graphs, property records, converters, validator indexes)
+    share a single string object per URI instead of one copy per reference.
+    URIs are kept as strings, not mapped to integer IDs: the hash of a string is
+    cached and an interned string compares equal to itself by identity, so they are
+    about as fast as integer keys, without converting IDs back at the API boundary.
+
+    :arg uris: the URIs to add to the table
+    :arg UriTable base: a table looked up first and never modified, e.g. the table of
+                        the base schema shared by all Schema instances extending it,
+                        so only the URIs missing from it are added to this table
+    """
+
+    def __init__(self, uris=(), base=None):
+        self.base = base
+        self.uris = {}
+        for uri in uris:
+            self.intern(uri)
+
+    def get(self, uri, default=None):
+        """Return the canonical string object of uri, or default if it's not in the table"""
+        if self.base is not None:
+            canonical = self.base.get(uri)
+            if canonical is not None:
+                return canonical
+        return self.uris.get(uri, default)
+
+    def intern(self, uri):
+        """Add uri to the table if needed, and return its canonical string object"""
+        canonical = self.get(uri)
+        if canonical is None:
+            canonical = self.uris[uri] = uri
+        return canonical
+
+    def __len__(self):
+        return len(self.uris) + (len(self.base) if self.base is not None else 0)
+
+    def __contains__(self, uri):
+        return self.get(uri) is not None
+
+
 def expand_curie_to_uri(curie, context_info):
     """Expand curie to uri based on the context given
 
@@ -155,12 +250,20 @@ def expand_curie_to_uri(curie, context_info):
         return curie
 
 
-def preprocess_schema(schema):
+def preprocess_schema(schema, uri_table=None):
     """Expand all curies in a SchemaOrg JSON-LD file into URI
 
     :arg dict schema: A JSON-LD object representing the schema
+    :arg UriTable uri_table: if provided, the @id values (of the records and of their
+                             references) are interned in it
     """
     context = schema["@context"]
+
+    def intern_uri(uri):
+        if uri_table is not None and isinstance(uri, str):
+            return uri_table.intern(uri)
+        return uri
+
     new_schema = {"@context": context, "@graph": []}
     for record in schema["@graph"]:
         # if a class is superseded, no need to load into graph
@@ -172,6 +275,8 @@ def preprocess_schema(schema):
             for k, v in record.items():
                 if k == VALIDATION_FIELD or k in ALT_VALIDATION_FIELDS:
                     new_record[k] = v
+                elif k == "@id" and isinstance(v, str):
+                    new_record[k] = intern_uri(expand_curie_to_uri(v, context))
                 elif isinstance(v, str):
                     new_record[expand_curie_to_uri(k, context)] = expand_curie_to_uri(v, context)
                 elif isinstance(v, list):
@@ -179,7 +284,7 @@ def preprocess_schema(schema):
                         new_record[expand_curie_to_uri(k, context)] = []
                         for _item in v:
                             new_record[expand_curie_to_uri(k, context)].append(
-                                {"@id": expand_curie_to_uri(_item["@id"], context)}
+                                {"@id": intern_uri(expand_curie_to_uri(_item["@id"], context))}
                             )
                     else:
                         new_record[expand_curie_to_uri(k, context)] = [
@@ -187,7 +292,7 @@ def preprocess_schema(schema):
                         ]
                 elif isinstance(v, dict) and "@id" in v:
                     new_record[expand_curie_to_uri(k, context)] = {
-                        "@id": expand_curie_to_uri(v["@id"], context)
+                        "@id": intern_uri(expand_curie_to_uri(v["@id"], context))
                     }
                 elif v is None:
                     new_record[expand_curie_to_uri(k, context)] = None
@@ -199,6 +304,24 @@ def preprocess_schema(schema):
     return new_schema
 
 
+def index_schema(schema):
+    """Index the classes and properties defined in a preprocessed schema
+
+    :arg dict schema: A JSON-LD object already processed by preprocess_schema
+    :returns: a dict with "schema" (the input schema), "classes" and "properties"
+              (lists of @id) keys
+    """
+    _index = {"schema": schema, "classes": [], "properties": []}
+    for _record in schema["@graph"]:
+        if "@type" in _record:
+            _type = str2list(_record["@type"])
+            if "rdfs:Property" in _type:
+                _index["properties"].append(_record["@id"])
+            elif "rdfs:Class" in _type:
+                _index["classes"].append(_record["@id"])
+    return _index
+
+
 def extract_name_from_uri_or_curie(item, schema=None):
     """Extract name from uri or curie
 
@@ -215,9 +338,9 @@ def extract_name_from_uri_or_curie(item, schema=None):
     # handle curie, get the last element after ":"
     elif "http" not in item and len(item.split(":")) == 2:
         return item.split(":")[-1]
-    # handle URI, get the last element after "/"
+    # handle URI, get the last element after "/" (or "#", e.g. "http://example.org/vocab#Foo")
     elif len(item.split("//")[-1].split("/")) > 1:
-        return item.split("//")[-1].split("/")[-1]
+        return item.split("//")[-1].split("/")[-1].split("#")[-1]
     # otherwise, rsise ValueError
     else:
         raise ValueError("{} should be converted to either URI or curie".format(item))
@@ -1,20 +1,29 @@
+import hashlib
 import json
+import pickle
 import re
+import threading
+import warnings
+import weakref
 
 import networkx as nx
 import requests
 import yaml
 
+from .curies import UriTable, index_schema, preprocess_schema
 from .settings import (
     BASE_SCHEMA,
     DATATYPES,
     DDE_SCHEMA_BASE_URL,
     IGNORED_CLASS_PROPERTY,
+    SCHEMA_CACHE_DIR,
+    SCHEMA_CACHE_MAX_SIZE,
     SCHEMAORG_DEFAULT_VERSION,
     SCHEMAORG_JSONLD_BASE_URL,
+    SCHEMAORG_OFFLINE,
     SCHEMAORG_VERSION_URL,
 )
-from .utils import dict2list, merge_schema, timed_lru_cache
+from .utils import FileCache, dict2list, merge_schema, timed_lru_cache
 
 
 def load_json_or_yaml(file_path):
@@ -64,12 +73,60 @@ def get_latest_schemaorg_version():
     return latest
 
 
-def get_schemaorg_version():
-    """Get the current version of schemaorg"""
+def get_schema_cache(cache_dir=None):
+    """Return the FileCache for the given cache_dir, or None if the on-disk cache is disabled
+
+    :arg str cache_dir: the cache directory, default to SCHEMA_CACHE_DIR if None,
+                        an empty string disables the on-disk cache
+    """
+    if cache_dir is None:
+        cache_dir = SCHEMA_CACHE_DIR
+    if not cache_dir:
+        return None
+    return FileCache(cache_dir, max_size=SCHEMA_CACHE_MAX_SIZE)
+
+
+def _version_key(version):
+    """sort key for version strings like "29.3" """
+    return tuple(int(x) if x.isdigit() else 0 for x in version.split("."))
+
+
+def get_cached_schemaorg_versions(cache_dir=None):
+    """Return the sorted list of schemaorg versions available in the on-disk cache"""
+    cache = get_schema_cache(cache_dir)
+    if not cache:
+        return []
+    versions = [
+        key[len("schemaorg-") :] for key in cache.keys() if key.startswith("schemaorg-")
+    ]
+    return sorted(versions, key=_version_key)
+
+
+def get_schemaorg_version(offline=None, cache_dir=None):
+    """Get the current version of schemaorg
+
+    :arg bool offline: if True, do not query the latest version online, return the
+                       latest version in the on-disk cache instead.
+    """
+    if offline is None:
+        offline = SCHEMAORG_OFFLINE
+    if offline:
+        cached_versions = get_cached_schemaorg_versions(cache_dir)
+        return cached_versions[-1] if cached_versions else SCHEMAORG_DEFAULT_VERSION
+    # the latest version is also kept in the on-disk cache for an hour, so that a
+    # new process does not need to query the github API again
+    cache = get_schema_cache(cache_dir)
+    if cache:
+        cached_version = cache.get("schemaorg-latest", suffix=".txt", max_age=3600)
+        if cached_version:
+            return cached_version.decode("utf-8")
     try:
         version = get_latest_schemaorg_version()
     except ValueError:
         version = SCHEMAORG_DEFAULT_VERSION
+    else:
+        if cache:
+            cache.set("schemaorg-latest", version.encode("utf-8"), suffix=".txt")
     return version
 
 
@@ -84,14 +141,34 @@ def construct_schemaorg_url(version):
 
 
 @timed_lru_cache(seconds=3600, maxsize=10)  # caching for 1hr
-def load_schemaorg(version=None, verbose=False):
+def load_schemaorg(version=None, verbose=False, cache_dir=None, offline=None):
     """Load SchemaOrg vocabulary
 
+    A downloaded release is saved to the on-disk cache (see SCHEMA_CACHE_DIR), so
+    later loads of the same version, even from a new process, only read a local file.
+
     :arg float version: The schemaorg schema version, e.g 13.0
+    :arg str cache_dir: the on-disk cache directory, default to SCHEMA_CACHE_DIR if None,
+                        an empty string disables the on-disk cache
+    :arg bool offline: if True, only load schemaorg from the on-disk cache, default to SCHEMAORG_OFFLINE
     """
+    if offline is None:
+        offline = SCHEMAORG_OFFLINE
     # if version is not specified, use the latest one by default
     if not version:
-        version = get_schemaorg_version()
+        version = get_schemaorg_version(offline=offline, cache_dir=cache_dir)
+    cache = get_schema_cache(cache_dir)
+    cache_key = f"schemaorg-{version}"
+    if cache:
+        cached_data = cache.get(cache_key)
+        if cached_data is not None:
+            if verbose:
+                print(f"Loading Schema.org schema v{version} from {cache.cache_dir}")
+            return json.loads(cached_data)
+    if offline:
+        raise ValueError(
+            f"version {version} is not available in the schemaorg cache and offline mode is on"
+        )
     url = construct_schemaorg_url(version)
     if verbose:
         print("Loading Schema.org schema from {}".format(url))
@@ -103,6 +180,8 @@ def load_schemaorg(version=None, verbose=False):
                 record for record in schema_data["@graph"]
                 if record.get("@id", "").startswith("schema:")
             ]
+        if cache:
+            cache.set(cache_key, json.dumps(schema_data).encode("utf-8"))
         return schema_data
     except ValueError:
         raise ValueError(
@@ -121,6 +200,132 @@ def load_schemaorg(version=None, verbose=False):
 #     return load_json_or_yaml(_path)
 
 
+# bump this when the content of the base schema snapshot changes
+SNAPSHOT_FORMAT_VERSION = 3
+
+# process-wide registry of the ProcessedBaseSchema objects currently in use, so that
+# Schema instances extending the same base schemas share one read-only copy of them.
+# An entry is released once no Schema instance holds a reference to it.
+_processed_base_schemas = weakref.WeakValueDictionary()
+_processed_base_schemas_lock = threading.RLock()
+
+
+class ProcessedBaseSchema:
+    """The preprocessed base schema with its networkx graph, ready to be
+    extended by user schemas. It can be saved to and loaded from a binary
+    snapshot, so that the preprocessing only needs to run once per base schema.
+
+    :arg dict schema: the preprocessed base schema
+    :arg networkx.DiGraph graph: the networkx graph built from the preprocessed schema
+    :arg list identity: a JSON-serializable value identifying the base schema (e.g.
+                        the loaded namespaces and their versions), None if unknown
+    :arg UriTable uri_table: the table the URIs of schema are interned in, built from
+                             the graph nodes if None
+    """
+
+    def __init__(self, schema, graph, identity=None, uri_table=None):
+        self.schema = schema
+        # the graph is shared by multiple Schema instances, make it read-only
+        self.graph = nx.freeze(graph)
+        self.identity = identity
+        self.uri_table = uri_table if uri_table is not None else UriTable(graph)
+        self.class_uris = [
+            node
+            for node, attrdict in graph.nodes(data=True)
+            if attrdict.get("type") in ["Class", "DataType"]
+        ]
+        self.property_uris = [
+            node for node, attrdict in graph.nodes(data=True) if attrdict.get("type") == "Property"
+        ]
+
+    @property
+    def index(self):
+        """The index of classes and properties in the schema, see index_schema"""
+        if getattr(self, "_index", None) is None:
+            self._index = index_schema(self.schema)
+        return self._index
+
+    @property
+    def class_set(self):
+        """The frozenset of the classes of index, shared by the validators of all the
+        Schema instances extending this base schema
+        """
+        if getattr(self, "_class_set", None) is None:
+            self._class_set = frozenset(self.index["classes"])
+        return self._class_set
+
+    @classmethod
+    def build(cls, base_schema, identity=None):
+        """Preprocess the raw base schema and load it into networkx"""
+        uri_table = UriTable()
+        schema = preprocess_schema(base_schema, uri_table=uri_table)
+        return cls(
+            schema, load_schema_into_networkx(schema), identity=identity, uri_table=uri_table
+        )
+
+    @staticmethod
+    def get_snapshot_key(identity):
+        """Return the snapshot cache key for the given base schema identity
+
+        The key only depends on the names of the base schemas, not on their versions,
+        so that a new snapshot replaces the superseded one in the on-disk cache
+        (from_snapshot checks the identity and the versions of a loaded snapshot).
+        """
+        _names = [_id.rsplit("@", 1)[0] for _id in identity]
+        _key = json.dumps(_names)
+        return "base-snapshot-" + hashlib.sha256(_key.encode("utf-8")).hexdigest()[:16]
+
+    def to_snapshot(self):
+        """Serialize into a binary snapshot (bytes)"""
+        from . import __version__
+
+        return pickle.dumps(
+            {
+                "format": SNAPSHOT_FORMAT_VERSION,
+                "version": __version__,
+                "identity": self.identity,
+                "schema": self.schema,
+                # the pickled DiGraph keeps its node/edge tables as is, which is
+                # much faster to restore than re-adding all nodes and edges
+                "graph": self.graph,
+                "class_uris": self.class_uris,
+                "property_uris": self.property_uris,
+                # pickle keeps a single copy of each interned URI
+                "uri_table": self.uri_table,
+            },
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+    @classmethod
+    def from_snapshot(cls, data, identity=None):
+        """Load from a binary snapshot created by to_snapshot. Return None if the
+        snapshot is invalid or stale (created for a different base schema identity,
+        library version or snapshot format).
+
+        Note that snapshots are pickle files, only load them from a trusted location.
+        """
+        from . import __version__
+
+        try:
+            snapshot = pickle.loads(data)
+        except Exception:
+            return None
+        if not isinstance(snapshot, dict) or (
+            snapshot.get("format"),
+            snapshot.get("version"),
+            snapshot.get("identity"),
+        ) != (SNAPSHOT_FORMAT_VERSION, __version__, identity):
+            return None
+        obj = cls.__new__(cls)
+        obj.schema = snapshot["schema"]
+        obj.graph = snapshot["graph"]
+        obj.identity = identity
+        obj.class_uris = snapshot["class_uris"]
+        obj.property_uris = snapshot["property_uris"]
+        obj.uri_table = snapshot["uri_table"]
+        return obj
+
+
 class BaseSchemaLoader:
     """A customizable class for loading base schemas (those schemas
     you can reference and extend in your own schema, for example,
@@ -131,32 +336,123 @@ class BaseSchemaLoader:
                                # if set to a specific version, e.g. 29.3, load that
                                # version. Keeping it as None will load the latest version.
 
-    def __init__(self, verbose=False):
+    def __init__(self, verbose=False, cache_dir=None, offline=None, use_snapshot=True):
+        """
+        :arg str cache_dir: the on-disk cache directory for schemaorg releases and base schema
+                            snapshots, default to SCHEMA_CACHE_DIR if None, an empty string
+                            disables the on-disk cache
+        :arg bool offline: if True, only load schemaorg from the on-disk cache, default to SCHEMAORG_OFFLINE
+        :arg bool use_snapshot: if True, save the processed base schema as a binary snapshot
+                                in the on-disk cache and load it directly next time
+        """
         self.verbose = verbose
+        self.cache_dir = cache_dir
+        self.offline = SCHEMAORG_OFFLINE if offline is None else offline
+        self.use_snapshot = use_snapshot
 
     @property
-    @timed_lru_cache(seconds=3600, maxsize=10)  # caching for 1hr
     def registered_dde_schemas(self):
-        """Return a list of schema namespaces registered in DDE"""
-        url = DDE_SCHEMA_BASE_URL + "?field=_id&size=20"
-        if self.verbose:
-            print(f'Loading registered DDE schema list from "{url}"')
-        data = load_json_or_yaml(url)
-        return [s["namespace"] for s in data["hits"]]
+        """Return a list of schema namespaces registered in DDE, see registered_dde_schemas"""
+        return registered_dde_schemas(
+            verbose=self.verbose, cache_dir=self.cache_dir, offline=self.offline
+        )
 
     def is_a_dde_schema(self, schema):
         """Return True/False if a schema (as a namespace string) is
-        registered in DDE or not
+        registered in DDE or not. In the offline mode, only DDE schemas
+        available in the on-disk cache are recognized, a warning is issued
+        for a known DDE schema (in the cached DDE registry or in BASE_SCHEMA)
+        missing from the cache, since it cannot be loaded.
         """
+        if self.offline:
+            try:
+                self.load_dde_schemas(schema)
+            except ValueError:
+                if schema in self.registered_dde_schemas or schema in BASE_SCHEMA:
+                    warnings.warn(
+                        f'DDE schema "{schema}" is not available in the on-disk cache and '
+                        "offline mode is on, it is not loaded."
+                    )
+                return False
+            return True
         return schema in self.registered_dde_schemas
 
-    @timed_lru_cache(seconds=3600, maxsize=10)  # caching for 1hr
     def load_dde_schemas(self, schema):
-        """Load a registered schema from DDE schema API"""
-        url = DDE_SCHEMA_BASE_URL + schema
-        if self.verbose:
-            print(f'Loading registered DDE schema from "{url}"')
-        return load_json_or_yaml(url)["source"]
+        """Load a registered schema from DDE schema API, see load_dde_schemas"""
+        return load_dde_schemas(
+            schema, verbose=self.verbose, cache_dir=self.cache_dir, offline=self.offline
+        )
+
+    @staticmethod
+    def _get_base_list(base_schema):
+        if base_schema == []:
+            return []
+        else:
+            return base_schema or BASE_SCHEMA or []
+
+    def _get_schema_org_version(self):
+        self.schema_org_version = self.schema_org_version or get_schemaorg_version(
+            offline=self.offline, cache_dir=self.cache_dir
+        )
+        return self.schema_org_version
+
+    def get_base_schema_identity(self, base_schema):
+        """Return a list identifying the content of the base schemas to load, e.g.
+        ["schema.org@29.3"], used as the key of the base schema snapshot.
+        DDE schemas are identified by the hash of their content, since they are not versioned.
+
+        Return None if the identity cannot be determined, e.g. when a subclass
+        overrides the load method without overriding this method.
+        """
+        if type(self).load is not BaseSchemaLoader.load:
+            return None
+        identity = []
+        for _sc in self._get_base_list(base_schema):
+            if _sc == "schema" or _sc == "schema.org":
+                identity.append(f"schema.org@{self._get_schema_org_version()}")
+            elif self.is_a_dde_schema(_sc):
+                _digest = get_dde_schema_digest(
+                    _sc, verbose=self.verbose, cache_dir=self.cache_dir, offline=self.offline
+                )
+                identity.append(f"{_sc}@{_digest}")
+        return identity
+
+    def load_processed(self, base_schema):
+        """Load the base schema and return it as a ProcessedBaseSchema.
+
+        The same base schemas are only processed once per process, the returned
+        object is shared (read-only) with all Schema instances using it.
+        If use_snapshot is True, the processed base schema is loaded from the
+        snapshot in the on-disk cache if available and up-to-date, otherwise
+        it's built from the raw base schema and saved as a new snapshot.
+        """
+        identity = self.get_base_schema_identity(base_schema)
+        if identity is None:
+            return ProcessedBaseSchema.build(self.load(base_schema))
+        key = tuple(identity)
+        with _processed_base_schemas_lock:
+            processed = _processed_base_schemas.get(key)
+            if processed is None:
+                processed = self._load_or_build_snapshot(
+                    base_schema, identity, ProcessedBaseSchema.get_snapshot_key(identity)
+                )
+                _processed_base_schemas[key] = processed
+        return processed
+
+    def _load_or_build_snapshot(self, base_schema, identity, snapshot_key):
+        cache = get_schema_cache(self.cache_dir) if self.use_snapshot else None
+        if cache:
+            data = cache.get(snapshot_key, suffix=".pickle")
+            if data is not None:
+                processed = ProcessedBaseSchema.from_snapshot(data, identity=identity)
+                if processed:
+                    if self.verbose:
+                        print(f"Loaded processed base schema snapshot from {cache.cache_dir}")
+                    return processed
+        processed = ProcessedBaseSchema.build(self.load(base_schema), identity=identity)
+        if cache:
+            cache.set(snapshot_key, processed.to_snapshot(), suffix=".pickle")
+        return processed
 
     def load(self, base_schema):
         """Load base schema, schema contains base classes for
@@ -166,17 +462,19 @@ class BaseSchemaLoader:
             []   - empty list, do not load any base schemas
             ["schema.org, "bioschemas"]  - load specified base schemas
         """
-        if base_schema == []:
-            _base = []
-        else:
-            _base = base_schema or BASE_SCHEMA or []
+        _base = self._get_base_list(base_schema)
 
         _base_schema = []
         for _sc in _base:
             if _sc == "schema" or _sc == "schema.org":
-                self.schema_org_version = self.schema_org_version or get_schemaorg_version()
+                self._get_schema_org_version()
                 _base_schema.append(
-                    load_schemaorg(version=self.schema_org_version, verbose=self.verbose)
+                    load_schemaorg(
+                        version=self.schema_org_version,
+                        verbose=self.verbose,
+                        cache_dir=self.cache_dir,
+                        offline=self.offline,
+                    )
                 )
                 continue
             elif self.is_a_dde_schema(_sc):
@@ -187,27 +485,83 @@ class BaseSchemaLoader:
 
 
 @timed_lru_cache(seconds=3600, maxsize=10)  # caching for 1hr
-def registered_dde_schemas(verbose=False):
-    """Return a list of schema namespaces registered in DDE"""
+def registered_dde_schemas(verbose=False, cache_dir=None, offline=None):
+    """Return a list of schema namespaces registered in DDE
+
+    The list is kept for an hour, in the process and in the on-disk cache, so a new
+    process doesn't need to query the DDE API again.
+
+    :arg str cache_dir: the on-disk cache directory, default to SCHEMA_CACHE_DIR if None,
+                        an empty string disables the on-disk cache
+    :arg bool offline: if True, only return the list in the on-disk cache (of any age),
+                       or an empty list, default to SCHEMAORG_OFFLINE
+    """
+    if offline is None:
+        offline = SCHEMAORG_OFFLINE
+    cache = get_schema_cache(cache_dir)
+    if cache:
+        cached_data = cache.get("dde-registry", max_age=None if offline else 3600)
+        if cached_data is not None:
+            return json.loads(cached_data)
+    if offline:
+        return []
     url = DDE_SCHEMA_BASE_URL + "?field=_id&size=20"
     if verbose:
         print(f'Loading registered DDE schema list from "{url}"')
     data = load_json_or_yaml(url)
-    return [s["namespace"] for s in data["hits"]]
+    namespaces = [s["namespace"] for s in data["hits"]]
+    if cache:
+        cache.set("dde-registry", json.dumps(namespaces).encode("utf-8"))
+    return namespaces
 
 
 def is_a_dde_schema(schema):
-    """Return True/False if a schema is registered in DDE or not"""
-    return schema in registered_dde_schemas()
+    """Return True/False if a schema is registered in DDE or not, see BaseSchemaLoader"""
+    return BaseSchemaLoader().is_a_dde_schema(schema)
 
 
 @timed_lru_cache(seconds=3600, maxsize=10)  # caching for 1hr
-def load_dde_schemas(schema, verbose=False):
-    """Load a registered schema from DDE schema API"""
+def load_dde_schemas(schema, verbose=False, cache_dir=None, offline=None):
+    """Load a registered schema from DDE schema API
+
+    The loaded schema is shared in the process for an hour and saved to the on-disk
+    cache, which is read first, so a new process doesn't download it again within an hour.
+
+    :arg str cache_dir: the on-disk cache directory, default to SCHEMA_CACHE_DIR if None,
+                        an empty string disables the on-disk cache
+    :arg bool offline: if True, only load the schema from the on-disk cache (of any age),
+                       default to SCHEMAORG_OFFLINE
+    """
+    if offline is None:
+        offline = SCHEMAORG_OFFLINE
+    cache = get_schema_cache(cache_dir)
+    if cache:
+        cached_data = cache.get(f"dde-{schema}", max_age=None if offline else 3600)
+        if cached_data is not None:
+            if verbose:
+                print(f'Loading registered DDE schema "{schema}" from {cache.cache_dir}')
+            return json.loads(cached_data)
+    if offline:
+        raise ValueError(
+            f'DDE schema "{schema}" is not available in the on-disk cache and offline mode is on'
+        )
     url = DDE_SCHEMA_BASE_URL + schema
     if verbose:
         print(f'Loading registered DDE schema from "{url}"')
-    return load_json_or_yaml(url)["source"]
+    schema_data = load_json_or_yaml(url)["source"]
+    if cache:
+        cache.set(f"dde-{schema}", json.dumps(schema_data).encode("utf-8"))
+    return schema_data
+
+
+@timed_lru_cache(seconds=3600, maxsize=10)  # caching for 1hr
+def get_dde_schema_digest(schema, verbose=False, cache_dir=None, offline=None):
+    """Return a digest of the content of a DDE schema, which identifies its version,
+    since DDE schemas are not versioned
+    """
+    _source = load_dde_schemas(schema, verbose=verbose, cache_dir=cache_dir, offline=offline)
+    _content = json.dumps(_source, sort_keys=True)
+    return hashlib.sha256(_content.encode("utf-8")).hexdigest()[:16]
 
 
 def load_base_schema(base_schema=None, verbose=False):
@@ -217,31 +571,11 @@ def load_base_schema(base_schema=None, verbose=False):
        None - load default BASE_SCHEMA
        []   - empty list, do not load any base schemas
        ["schema.org, "bioschemas"]  - load specified base schemas
-    """
-    if base_schema == []:
-        _base = []
-    else:
-        _base = base_schema or BASE_SCHEMA or []
 
-    _base_schema = []
-    # if "schema.org" in _base or "schema" in _base:
-    #     _base_schema.append(
-    #         load_schemaorg(verbose=verbose)
-    #     )
-    # if "bioschemas" in _base:
-    #     _base_schema.append(
-    #         load_bioschemas(verbose=verbose)
-    #     )
-
-    for _sc in _base:
-        if _sc == "schema" or _sc == "schema.org":
-            _base_schema.append(load_schemaorg(verbose=verbose))
-            continue
-        elif _sc in registered_dde_schemas():
-            _base_schema.append(load_dde_schemas(_sc, verbose=verbose))
-
-    _base_schema = merge_schema(*_base_schema)
-    return _base_schema
+    Like BaseSchemaLoader, it uses the on-disk cache and the offline mode
+    set by SCHEMA_CACHE_DIR and SCHEMAORG_OFFLINE.
+    """
+    return BaseSchemaLoader(verbose=verbose).load(base_schema)
 
 
 def find_parent_child_relation(record, _type="Class"):
@@ -274,32 +608,42 @@ def find_parent_child_relation(record, _type="Class"):
     return edges
 
 
+def _get_ids(value):
+    """Return the list of @id of a {"@id": ...} reference or a list of references"""
+    if isinstance(value, dict):
+        return [value["@id"]]
+    elif isinstance(value, list):
+        return [_item["@id"] for _item in value]
+    return []
+
+
 def find_domain_range(record):
     """Find domain and range info of a record in schema"""
-    response = {"domain": [], "range": []}
-    if "http://schema.org/domainIncludes" in record:
-        if isinstance(record["http://schema.org/domainIncludes"], dict):
-            response["domain"] = [record["http://schema.org/domainIncludes"]["@id"]]
-        elif isinstance(record["http://schema.org/domainIncludes"], list):
-            response["domain"] = [
-                _item["@id"] for _item in record["http://schema.org/domainIncludes"]
-            ]
-    if "http://schema.org/rangeIncludes" in record:
-        if isinstance(record["http://schema.org/rangeIncludes"], dict):
-            response["range"] = [record["http://schema.org/rangeIncludes"]["@id"]]
-        elif isinstance(record["http://schema.org/rangeIncludes"], list):
-            response["range"] = [
-                _item["@id"] for _item in record["http://schema.org/rangeIncludes"]
-            ]
-    return (response["domain"], response["range"])
+    return (
+        _get_ids(record.get("http://schema.org/domainIncludes")),
+        _get_ids(record.get("http://schema.org/rangeIncludes")),
+    )
 
 
 def load_schema_into_networkx(schema, load_class=True, load_property=True, load_datatype=True):
-    """Construct networkx DiGraph based on Schema provided"""
+    """Construct networkx DiGraph based on Schema provided
+
+    Each property gets one record ({"description", "domain", "range", "inverse", "uri"}),
+    referenced (not copied) from the "properties" list of each class of its domain and
+    from the "used_by" list of each class of its range. The property node attributes
+    share the same domain/range lists.
+    """
     # initialize DiGraph for classes, properties and data types
     G = nx.DiGraph()
     edges = []
     classes = {}
+
+    def get_class(_id):
+        _class = classes.get(_id)
+        if _class is None:
+            _class = classes[_id] = {"type": "Class", "properties": [], "used_by": []}
+        return _class
+
     for record in schema["@graph"]:
         if record["@id"] in DATATYPES and load_datatype:
             G.add_node(
@@ -309,16 +653,7 @@ def load_schema_into_networkx(schema, load_class=True, load_property=True, load_
             )
             edges += find_parent_child_relation(record)
         elif record["@type"] == "rdfs:Class" and load_class:
-            if record["@id"] in classes:
-                classes[record["@id"]]["description"] = record["rdfs:comment"]
-                classes[record["@id"]]["type"] = "Class"
-            else:
-                classes[record["@id"]] = {
-                    "description": record["rdfs:comment"],
-                    "type": "Class",
-                    "properties": [],
-                    "used_by": [],
-                }
+            get_class(record["@id"])["description"] = record["rdfs:comment"]
             # add class edges
             edges += find_parent_child_relation(record)
         elif record["@type"] == "rdf:Property" and load_property:
@@ -326,14 +661,6 @@ def load_schema_into_networkx(schema, load_class=True, load_property=True, load_
             _inverse = record.get("http://schema.org/inverseOf")
             if _inverse:
                 _inverse = _inverse["@id"]
-            G.add_node(
-                record["@id"],
-                description=record["rdfs:comment"],
-                domain=_domain,
-                range=_range,
-                inverse=_inverse,
-                type="Property",
-            )
             property_info = {
                 "description": record["rdfs:comment"],
                 "domain": _domain,
@@ -341,29 +668,23 @@ def load_schema_into_networkx(schema, load_class=True, load_property=True, load_
                 "inverse": _inverse,
                 "uri": record["@id"],
             }
+            G.add_node(
+                record["@id"],
+                description=property_info["description"],
+                domain=_domain,
+                range=_range,
+                inverse=_inverse,
+                type="Property",
+            )
             for _id in _domain:
                 if _id not in DATATYPES:
-                    if _id not in classes:
-                        classes[_id] = {
-                            "properties": [property_info],
-                            "type": "Class",
-                            "used_by": [],
-                        }
-                    else:
-                        classes[_id]["properties"].append(property_info)
+                    get_class(_id)["properties"].append(property_info)
             for _id in _range:
                 if _id not in DATATYPES:
-                    if _id not in classes:
-                        classes[_id] = {
-                            "used_by": [property_info],
-                            "type": "Class",
-                            "properties": [],
-                        }
-                    else:
-                        classes[_id]["used_by"].append(property_info)
+                    get_class(_id)["used_by"].append(property_info)
             edges += find_parent_child_relation(record, _type="Property")
     G.add_edges_from(edges)
-    G.add_nodes_from(list(classes.items()))
+    G.add_nodes_from(classes.items())
 
     return G
 
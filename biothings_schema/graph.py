@@ -0,0 +1,139 @@
+from array import array
+
+import networkx as nx
+
+GRAPH_BACKENDS = ("networkx", "frozen")
+
+
+class FrozenNodeView:
+    """The nodes of a FrozenDiGraph, a read-only subset of networkx's NodeView API"""
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __call__(self, data=False):
+        if data:
+            return list(zip(self._graph._nodes, self._graph._attrs))
+        return self
+
+    def __getitem__(self, node):
+        return self._graph._attrs[self._graph._index[node]]
+
+    def __iter__(self):
+        return iter(self._graph._nodes)
+
+    def __len__(self):
+        return len(self._graph._nodes)
+
+    def __contains__(self, node):
+        return node in self._graph._index
+
+
+class FrozenDiGraph:
+    """A compact, read-only directed graph
+
+    Nodes get integer IDs in the order of the source graph. The successors and
+    predecessors are stored as CSR arrays (the neighbors of node i are
+    targets[offsets[i]:offsets[i + 1]]), and the node attribute dicts are shared
+    with the source graph instead of being copied. The successors/predecessors
+    orders are the same as in the source graph, so the traversals give the same
+    results as with networkx.
+
+    Only the read-only part of networkx.DiGraph API used by Schema is supported,
+    use to_networkx to run other networkx algorithms.
+    """
+
+    def __init__(self, nodes, attrs, successors, predecessors):
+        """
+        :arg list nodes: the nodes, in order
+        :arg list attrs: the attribute dict of each node
+        :arg list successors: the list of successors of each node
+        :arg list predecessors: the list of predecessors of each node
+        """
+        self._nodes = list(nodes)
+        self._attrs = list(attrs)
+        self._index = {node: idx for idx, node in enumerate(self._nodes)}
+        self._succ_offsets, self._succ = self._build_csr(successors)
+        self._pred_offsets, self._pred = self._build_csr(predecessors)
+        self.nodes = FrozenNodeView(self)
+
+    def _build_csr(self, neighbors):
+        offsets = array("i", [0])
+        targets = array("i")
+        for _neighbors in neighbors:
+            targets.extend(self._index[_node] for _node in _neighbors)
+            offsets.append(len(targets))
+        return offsets, targets
+
+    @classmethod
+    def from_networkx(cls, graph):
+        """Build a FrozenDiGraph from a networkx DiGraph (or a subgraph view)"""
+        nodes = list(graph)
+        return cls(
+            nodes,
+            [graph.nodes[node] for node in nodes],
+            [graph.successors(node) for node in nodes],
+            [graph.predecessors(node) for node in nodes],
+        )
+
+    def to_networkx(self):
+        """Return a networkx DiGraph copy of the graph"""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.nodes(data=True))
+        graph.add_edges_from(self.edges())
+        return graph
+
+    def _neighbors(self, offsets, targets, node):
+        try:
+            idx = self._index[node]
+        except KeyError:
+            raise nx.NetworkXError(f"The node {node} is not in the digraph.")
+        return [self._nodes[target] for target in targets[offsets[idx] : offsets[idx + 1]]]
+
+    def successors(self, node):
+        """Return an iterator over the successors of node"""
+        return iter(self._neighbors(self._succ_offsets, self._succ, node))
+
+    def predecessors(self, node):
+        """Return an iterator over the predecessors of node"""
+        return iter(self._neighbors(self._pred_offsets, self._pred, node))
+
+    def edges(self):
+        """Return the list of (source, target) edges"""
+        return [
+            (source, self._nodes[target])
+            for idx, source in enumerate(self._nodes)
+            for target in self._succ[self._succ_offsets[idx] : self._succ_offsets[idx + 1]]
+        ]
+
+    def is_directed(self):
+        return True
+
+    def number_of_nodes(self):
+        return len(self._nodes)
+
+    def number_of_edges(self):
+        return len(self._succ)
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return node in self._index
+
+
+def build_subgraph(graph, nodes, backend="networkx"):
+    """Return the subgraph of graph induced by nodes, materialized with the given backend
+
+    :arg str backend: one of GRAPH_BACKENDS, "networkx" copies the subgraph into a new
+                      networkx.DiGraph, "frozen" builds a read-only FrozenDiGraph
+    """
+    # filter with a function rather than a node set, so that the subgraph keeps the
+    # node and edge order of graph, instead of the (hash dependent) order of the set
+    subgraph = nx.subgraph_view(graph, filter_node=frozenset(nodes).__contains__)
+    if backend == "frozen":
+        return FrozenDiGraph.from_networkx(subgraph)
+    return subgraph.copy()
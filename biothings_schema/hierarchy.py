@@ -0,0 +1,378 @@
+from bisect import bisect_right
+from collections import deque
+from itertools import islice
+
+import networkx as nx
+
+
+class HierarchyIndex:
+    """Precomputed information about a class (or property) hierarchy, a DAG with
+    edges pointing from the parent to the child.
+
+    It's built once per loaded schema and reused by all SchemaClass/SchemaProperty
+    queries, instead of traversing the whole graph again on every call.
+
+    :arg graph: the hierarchy graph, only its node iteration, successors and
+                predecessors methods are used
+    :arg str preferred_root: the node used as the root if it exists in the graph,
+                             e.g. "http://schema.org/Thing"
+    :arg str closure: the transitive closure index to precompute, one of CLOSURE_INDEXES.
+                      None computes the ancestors/descendants by traversing the graph
+                      on each query, with no extra memory, except for is_descendant,
+                      which builds the "interval" labelling of the descendants on its
+                      first call (unless the graph has a cycle); "bitset" stores the
+                      ancestors and descendants of each node as integer bitsets,
+                      which takes O(n^2) bits of memory for n nodes; "interval"
+                      stores them as intervals of a DFS post-order numbering, which
+                      takes O(n) memory and answers is_descendant in O(1) time for
+                      a tree, growing with the number of nodes with several parents
+    """
+
+    CLOSURE_INDEXES = (None, "bitset", "interval")
+
+    def __init__(self, graph, preferred_root=None, closure=None):
+        if closure not in self.CLOSURE_INDEXES:
+            raise ValueError(
+                f"closure should be one of {', '.join(map(str, self.CLOSURE_INDEXES))}"
+            )
+        self.graph = graph
+        self.preferred_root = preferred_root
+        # the topological order and the values derived from it are only computed when
+        # needed, so the ancestors/descendants queries also work on a graph with cycles
+        self._topological_order = None
+        self._position = None
+        self._depth = None
+        self._is_dag = None
+        self._descendant_intervals = None
+        self.closure = closure
+        if closure == "bitset":
+            self._build_bitsets()
+        elif closure == "interval":
+            # label the descendants from the roots, and the ancestors from the leaves
+            self._descendant_intervals = self.descendant_intervals
+            leaves = [
+                node
+                for node in reversed(self.topological_order)
+                if next(iter(graph.successors(node)), None) is None
+            ]
+            self.ancestor_intervals = self._build_intervals(leaves, graph.predecessors)
+
+    @property
+    def topological_order(self):
+        """The nodes in topological order, raise networkx.NetworkXUnfeasible if the
+        graph contains a cycle
+        """
+        if self._topological_order is None:
+            self._topological_order = self._topological_sort(self.graph)
+        return self._topological_order
+
+    @property
+    def position(self):
+        """The position of each node in topological_order"""
+        if self._position is None:
+            self._position = {node: idx for idx, node in enumerate(self.topological_order)}
+        return self._position
+
+    @property
+    def roots(self):
+        """The nodes without parents, in topological order"""
+        return [node for node in self.topological_order if not self._has_parents(node)]
+
+    @property
+    def root(self):
+        """preferred_root if it's in the graph, otherwise the first node in topological order"""
+        if self.preferred_root in self.position:
+            return self.preferred_root
+        return self.topological_order[0] if self.topological_order else None
+
+    @property
+    def descendant_intervals(self):
+        """The interval labelling of the descendants of each node, see _build_intervals.
+        Raise networkx.NetworkXUnfeasible if the graph contains a cycle
+        """
+        if self._descendant_intervals is None:
+            self._descendant_intervals = self._build_intervals(self.roots, self.graph.successors)
+        return self._descendant_intervals
+
+    @property
+    def depth(self):
+        """The length of the longest path from a root node to each node"""
+        if self._depth is None:
+            self._depth = {}
+            for node in self.topological_order:
+                self._depth[node] = max(
+                    (self._depth[parent] + 1 for parent in self.graph.predecessors(node)),
+                    default=0,
+                )
+        return self._depth
+
+    def _build_bitsets(self):
+        """The bit i of ancestor_bits[node] (resp. descendant_bits[node]) is set
+        if topological_order[i] is an ancestor (resp. a descendant) of node
+        """
+        self.ancestor_bits = {}
+        for node in self.topological_order:
+            bits = 0
+            for parent in self.graph.predecessors(node):
+                bits |= self.ancestor_bits[parent] | (1 << self.position[parent])
+            self.ancestor_bits[node] = bits
+        self.descendant_bits = {}
+        for node in reversed(self.topological_order):
+            bits = 0
+            for child in self.graph.successors(node):
+                bits |= self.descendant_bits[child] | (1 << self.position[child])
+            self.descendant_bits[node] = bits
+
+    @staticmethod
+    def _build_intervals(sources, neighbors):
+        """Interval labelling (Agrawal et al. 1989) of the nodes reachable from sources
+
+        Nodes are numbered in the post-order of a DFS following neighbors. Each
+        node gets the sorted, merged intervals of the numbers of the nodes it
+        reaches (itself included): the interval of its DFS subtree, merged with the
+        intervals of its neighbors. Return a (numbers, post_order, intervals) tuple.
+        """
+        numbers = {}
+        post_order = []
+        subtree_start = {}
+        for source in sources:
+            if source in subtree_start:
+                continue
+            subtree_start[source] = len(post_order)
+            stack = [(source, iter(neighbors(source)))]
+            while stack:
+                node, _neighbors = stack[-1]
+                child = next(
+                    (_child for _child in _neighbors if _child not in subtree_start), None
+                )
+                if child is None:
+                    stack.pop()
+                    numbers[node] = len(post_order)
+                    post_order.append(node)
+                else:
+                    subtree_start[child] = len(post_order)
+                    stack.append((child, iter(neighbors(child))))
+        # in a DAG, the DFS post-order visits the neighbors of a node before the node
+        intervals = {}
+        for node in post_order:
+            _intervals = sorted(
+                [(subtree_start[node], numbers[node])]
+                + [_interval for _child in neighbors(node) for _interval in intervals[_child]]
+            )
+            merged = [_intervals[0]]
+            for start, end in _intervals[1:]:
+                if start <= merged[-1][1] + 1:
+                    if end > merged[-1][1]:
+                        merged[-1] = (merged[-1][0], end)
+                else:
+                    merged.append((start, end))
+            intervals[node] = merged
+        return numbers, post_order, intervals
+
+    @staticmethod
+    def _in_intervals(number, intervals):
+        idx = bisect_right(intervals, (number, float("inf")))
+        return idx > 0 and intervals[idx - 1][1] >= number
+
+    @staticmethod
+    def _nodes_from_intervals(node, labelling):
+        numbers, post_order, intervals = labelling
+        nodes = {post_order[i] for start, end in intervals[node] for i in range(start, end + 1)}
+        nodes.discard(node)
+        return nodes
+
+    def _nodes_from_bits(self, bits):
+        nodes = set()
+        while bits:
+            lowest = bits & -bits
+            nodes.add(self.topological_order[lowest.bit_length() - 1])
+            bits ^= lowest
+        return nodes
+
+    def _traverse(self, node, neighbors):
+        seen = {node}
+        stack = [node]
+        while stack:
+            for _node in neighbors(stack.pop()):
+                if _node not in seen:
+                    seen.add(_node)
+                    stack.append(_node)
+        # like networkx.ancestors/descendants, node itself is excluded even in a cycle
+        seen.discard(node)
+        return seen
+
+    def ancestors(self, node):
+        """Return the set of ancestors of a node"""
+        if self.closure == "bitset":
+            return self._nodes_from_bits(self.ancestor_bits[node])
+        elif self.closure == "interval":
+            return self._nodes_from_intervals(node, self.ancestor_intervals)
+        return self._traverse(node, self.graph.predecessors)
+
+    def descendants(self, node):
+        """Return the set of descendants of a node"""
+        if self.closure == "bitset":
+            return self._nodes_from_bits(self.descendant_bits[node])
+        elif self.closure == "interval":
+            return self._nodes_from_intervals(node, self.descendant_intervals)
+        return self._traverse(node, self.graph.successors)
+
+    def ordered_ancestors(self, node):
+        """Return the list of ancestors of a node in breadth-first order, i.e. its parents
+        first, then their parents, and so on
+        """
+        seen = {node}
+        order = []
+        queue = deque([node])
+        while queue:
+            for parent in self.graph.predecessors(queue.popleft()):
+                if parent not in seen:
+                    seen.add(parent)
+                    order.append(parent)
+                    queue.append(parent)
+        return order
+
+    def is_descendant(self, node, ancestor):
+        """Return True if ancestor is an ancestor of node (node itself excluded)"""
+        if node == ancestor or node not in self.graph or ancestor not in self.graph:
+            return False
+        if self.closure == "bitset":
+            return bool(self.ancestor_bits[node] >> self.position[ancestor] & 1)
+        elif self.closure == "interval" or self.is_dag():
+            # without a closure index, the descendant intervals are built on the first call
+            numbers, _, intervals = self.descendant_intervals
+            return self._in_intervals(numbers[node], intervals[ancestor])
+        return ancestor in self.ancestors(node)
+
+    def edge_bfs(self, source):
+        """Generate the edges reachable from source in breadth-first order,
+        in the same order as networkx.edge_bfs
+        """
+        if source not in self.graph:
+            return
+        visited = {source}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for child in self.graph.successors(node):
+                if child not in visited:
+                    visited.add(child)
+                    queue.append(child)
+                yield node, child
+
+    def iter_paths(self, source, target, max_paths=None, max_depth=None):
+        """Lazily generate the paths from source to target, in the same order as
+        networkx.all_simple_paths. Only the ancestors of target are explored, so
+        the cost depends on the ancestor DAG of target, not on the whole graph.
+
+        :arg int max_paths: stop after generating max_paths paths
+        :arg int max_depth: only generate the paths with at most max_depth edges
+
+        Like count_paths and ancestor_graph, it raises networkx.NetworkXUnfeasible
+        if the graph contains a cycle.
+        """
+        paths = self._iter_paths(source, target, max_depth)
+        if max_paths is not None:
+            paths = islice(paths, max_paths)
+        return paths
+
+    def _iter_paths(self, source, target, max_depth=None):
+        self._require_dag()
+        allowed = self.ancestors(target)
+        if source == target or source not in allowed:
+            return
+        allowed.add(target)
+        path = [source]
+        stack = [iter(self.graph.successors(source))]
+        while stack:
+            child = next((_child for _child in stack[-1] if _child in allowed), None)
+            if child is None:
+                stack.pop()
+                path.pop()
+            elif child == target:
+                # path + [child] has len(path) edges
+                if max_depth is None or len(path) <= max_depth:
+                    yield path + [child]
+            elif max_depth is None or len(path) < max_depth:
+                path.append(child)
+                stack.append(iter(self.graph.successors(child)))
+
+    def count_paths(self, source, target):
+        """Return the number of paths from source to target, computed by dynamic
+        programming over the topological order, without enumerating the paths.
+        """
+        self._require_dag()
+        if source == target:
+            return 0
+        dag = self.ancestors(target)
+        if source not in dag:
+            return 0
+        dag.add(target)
+        counts = {source: 1}
+        for node in sorted(dag, key=self.position.__getitem__):
+            if node != source:
+                counts[node] = sum(
+                    counts.get(parent, 0) for parent in self.graph.predecessors(node)
+                )
+        return counts[target]
+
+    def ancestor_graph(self, node):
+        """Return the sub-DAG (as a new networkx.DiGraph) formed by node and all its ancestors"""
+        self._require_dag()
+        nodes = self.ancestors(node)
+        nodes.add(node)
+        dag = nx.DiGraph()
+        dag.add_nodes_from(sorted(nodes, key=self.position.__getitem__))
+        dag.add_edges_from(
+            (parent, child)
+            for child in dag.nodes
+            for parent in self.graph.predecessors(child)
+        )
+        return dag
+
+    def is_dag(self):
+        """Return True if the graph contains no cycle"""
+        if self._is_dag is None:
+            try:
+                self._require_dag()
+            except nx.NetworkXUnfeasible:
+                self._is_dag = False
+            else:
+                self._is_dag = True
+        return self._is_dag
+
+    def _require_dag(self):
+        """Raise networkx.NetworkXUnfeasible if the graph contains a cycle"""
+        return self.topological_order
+
+    def _has_parents(self, node):
+        return next(iter(self.graph.predecessors(node)), None) is not None
+
+    @staticmethod
+    def _topological_sort(graph):
+        """Same order as networkx.topological_sort: nodes are sorted by generations,
+        and the nodes in each generation keep the graph order.
+        Raise networkx.NetworkXUnfeasible if the graph contains a cycle.
+        """
+        indegree = {}
+        generation = []
+        for node in graph:
+            _degree = sum(1 for _ in graph.predecessors(node))
+            if _degree:
+                indegree[node] = _degree
+            else:
+                generation.append(node)
+        order = []
+        while generation:
+            order.extend(generation)
+            next_generation = []
+            for node in generation:
+                for child in graph.successors(node):
+                    indegree[child] -= 1
+                    if not indegree[child]:
+                        next_generation.append(child)
+                        del indegree[child]
+            generation = next_generation
+        if indegree:
+            raise nx.NetworkXUnfeasible("Graph contains a cycle or graph changed during iteration")
+        return order
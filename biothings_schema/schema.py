@@ -1,21 +1,24 @@
-import inspect
 import json
 import warnings
 from functools import partial
+from itertools import islice
 
 import networkx as nx
 from jsonschema import FormatChecker, validate
 
 from .base import visualize
-from .curies import CurieUriConverter, preprocess_schema
+from .curies import CurieUriConverter, UriTable, preprocess_schema
 from .dataload import BaseSchemaLoader, load_json_or_yaml, load_schema_into_networkx
+from .graph import GRAPH_BACKENDS, FrozenDiGraph, build_subgraph
+from .hierarchy import HierarchyIndex
 from .settings import (
     COMMON_NAMESPACES,
     DATATYPES,
     DEFAULT_JSONSCHEMA_METASCHEMA,
+    ROOT_CLASS,
     VALIDATION_FIELD,
 )  # ALT_VALIDATION_FIELDS,
-from .utils import expand_ref, merge_schema, merge_schema_networkx
+from .utils import expand_ref, merge_schema, merge_schema_networkx, str2list
 from .validator import SchemaValidator
 
 METHODS_RETURN_LIST = [
@@ -36,6 +39,8 @@ METHODS_RETURN_DICT = ["describe"]
 
 METHODS_RETURN_STR = ["description", "label", "prefix", "uri", "inverse_property"]
 
+DATATYPE_URIS = frozenset(DATATYPES)
+
 
 def check_defined(scls, method_name):
     if not scls.defined_in_schema:
@@ -54,9 +59,9 @@ def transform_schemaclasses_lst(se, scls_list, output_type):
     if output_type == "uri":
         return scls_list
     elif output_type == "curie":
-        return list(map(se.cls_converter.get_curie, scls_list))
+        return se.cls_converter.get_curies(scls_list)
     elif output_type == "label":
-        return list(map(se.cls_converter.get_label, scls_list))
+        return se.cls_converter.get_labels(scls_list)
     elif output_type == "PythonClass":
         return list(map(partial(SchemaClass, schema=se), scls_list))
     else:
@@ -66,25 +71,94 @@ def transform_schemaclasses_lst(se, scls_list, output_type):
 
 
 def transform_property_info_list(se, prop_list, output_type):
-    """Transform a list of properties"""
-    props = [
+    """Transform a list of properties
+
+    The transformed record of each property record is built once per output_type and
+    cached in the schema, a copy of it is returned on each call. The cache is keyed by
+    the record object, not by its URI: a property redefined by the user schema has a
+    different record than the base schema one.
+    """
+    cache = se._property_infos
+    missing = [
+        _prop
+        for _prop in {id(_prop): _prop for _prop in prop_list}.values()
+        if (id(_prop), output_type) not in cache
+    ]
+    if missing:
+        uris = [_prop.get("uri") for _prop in missing]
+        for _prop, _curie, _label in zip(
+            missing, se.cls_converter.get_curies(uris), se.cls_converter.get_labels(uris)
+        ):
+            # keep a reference to the record, so its id is not reused
+            cache[(id(_prop), output_type)] = (
+                _prop,
+                {
+                    "description": _prop.get("description"),
+                    "domain": transform_schemaclasses_lst(se, _prop.get("domain"), output_type),
+                    "range": transform_schemaclasses_lst(se, _prop.get("range"), output_type),
+                    "curie": _curie,
+                    "label": _label,
+                    "uri": _prop.get("uri"),
+                    "object": se.get_property(_prop.get("uri")),
+                },
+            )
+    props = []
+    for _prop in prop_list:
+        _info = dict(cache[(id(_prop), output_type)][1])
+        _info["domain"] = list(_info["domain"])
+        _info["range"] = list(_info["range"])
+        props.append(_info)
+    return props
+
+
+def transform_paths(convert, paths):
+    """Transform a list of paths with a single batch conversion of all their items
+
+    :arg convert: a batch conversion method, e.g. CurieUriConverter.get_curies
+    """
+    paths = [list(_path) for _path in paths]
+    converted = iter(convert([_item for _path in paths for _item in _path]))
+    return [list(islice(converted, len(_path))) for _path in paths]
+
+
+def transform_class_groups(convert, response, se, output_type):
+    """Transform the output of list_properties grouped by class"""
+    classes = convert([_item.get("class") for _item in response])
+    return [
         {
-            "description": _prop.get("description"),
-            "domain": transform_schemaclasses_lst(se, _prop.get("domain"), output_type),
-            "range": transform_schemaclasses_lst(se, _prop.get("range"), output_type),
-            "curie": se.cls_converter.get_curie(_prop.get("uri")),
-            "label": se.cls_converter.get_label(_prop.get("uri")),
-            "uri": _prop.get("uri"),
-            "object": se.get_property(_prop.get("uri")),
+            "class": _class,
+            "properties": transform_property_info_list(se, _item.get("properties"), output_type),
+        }
+        for _item, _class in zip(response, classes)
+    ]
+
+
+def copy_property_records(prop_list):
+    """Copy a list of property records of the schema graph (with their domain and range
+    lists), which are shared with other Schema instances and should not be modified
+    """
+    return [
+        {
+            _key: list(_value) if isinstance(_value, list) else _value
+            for _key, _value in _prop.items()
         }
         for _prop in prop_list
     ]
-    return props
 
 
 def restructure_output(scls, response, func_name, output_type):
     if output_type == "uri":
         if func_name in METHODS_RETURN_LIST:
+            if func_name == "list_properties":
+                return [
+                    {
+                        "class": _item.get("class"),
+                        "properties": copy_property_records(_item.get("properties")),
+                    }
+                    for _item in response
+                ]
+            elif func_name == "used_by":
+                return copy_property_records(response)
             return list(response)
         elif func_name in METHODS_RETURN_DICT:
             return response
@@ -93,45 +167,27 @@ def restructure_output(scls, response, func_name, output_type):
     elif output_type == "curie":
         if func_name in METHODS_RETURN_LIST:
             if func_name == "parent_classes":
-                return [
-                    list(map(scls.se.cls_converter.get_curie, _path))
-                    for _path in response
-                ]
+                return transform_paths(scls.se.cls_converter.get_curies, response)
             elif func_name == "list_properties":
-                return [
-                    {
-                        "class": scls.se.cls_converter.get_curie(_item.get("class")),
-                        "properties": transform_property_info_list(
-                            scls.se, _item.get("properties"), output_type
-                        ),
-                    }
-                    for _item in response
-                ]
+                return transform_class_groups(
+                    scls.se.cls_converter.get_curies, response, scls.se, output_type
+                )
             elif func_name == "used_by":
                 return transform_property_info_list(scls.se, response, output_type)
             else:
-                return list(map(scls.se.cls_converter.get_curie, response))
+                return scls.se.cls_converter.get_curies(response)
     elif output_type == "label":
         if func_name in METHODS_RETURN_LIST:
             if func_name == "parent_classes":
-                return [
-                    list(map(scls.se.cls_converter.get_label, _path))
-                    for _path in response
-                ]
+                return transform_paths(scls.se.cls_converter.get_labels, response)
             elif func_name == "list_properties":
-                return [
-                    {
-                        "class": scls.se.cls_converter.get_label(_item.get("class")),
-                        "properties": transform_property_info_list(
-                            scls.se, _item.get("properties"), output_type
-                        ),
-                    }
-                    for _item in response
-                ]
+                return transform_class_groups(
+                    scls.se.cls_converter.get_labels, response, scls.se, output_type
+                )
             elif func_name == "used_by":
                 return transform_property_info_list(scls.se, response, output_type)
             else:
-                return list(map(scls.se.cls_converter.get_label, response))
+                return scls.se.cls_converter.get_labels(response)
     elif output_type == "PythonClass":
         if func_name in METHODS_RETURN_LIST:
             if func_name == "parent_classes":
@@ -179,11 +235,29 @@ class Schema:
         validator_options=None,
         base_schema_loader=None,
         schema_org_version=None,
+        closure_index=None,
+        graph_backend="networkx",
     ):
+        if graph_backend not in GRAPH_BACKENDS:
+            raise ValueError("graph_backend should be one of " + ", ".join(GRAPH_BACKENDS))
+        # the backend of the class-only, property-only and full schema graphs, "frozen"
+        # stores them as compact read-only graphs (see graph.FrozenDiGraph)
+        self.graph_backend = graph_backend
+        if closure_index not in HierarchyIndex.CLOSURE_INDEXES:
+            raise ValueError(
+                "closure_index should be one of "
+                + ", ".join(map(str, HierarchyIndex.CLOSURE_INDEXES))
+            )
+        # precompute the transitive closure of the class and property hierarchies
+        # at load time, "interval" or "bitset", trading memory for faster queries
+        self.closure_index = closure_index
         self.validator_options = validator_options or {}
         self.base_schema_loaded = False
+        self._processed_base_schema = None
         self.schema = None
         self.validator = None
+        self.cls_converter = None
+        self.prop_converter = None
         self.base_schema_loader = base_schema_loader or BaseSchemaLoader()
         if isinstance(schema_org_version, str) and schema_org_version:
             # Set a specific schema.org version to load as base schemas.
@@ -204,6 +278,30 @@ class Schema:
         base_schema = base_schema or self.get_base_schema_list(_schema)
         self.load_schema(schema=_schema, base_schema=base_schema)
 
+    @property
+    def context(self):
+        """The JSON-LD context, with namespace/prefix as key, and URI as value
+        Assign a new dict or use update_context to change it, so the converters
+        rebuild their namespace -> prefix indexes.
+        """
+        return self._context
+
+    @context.setter
+    def context(self, context):
+        self._context = context
+        # the names of the cached SchemaClass/SchemaProperty instances and
+        # of the cached property records may change
+        self._schema_items = {}
+        self._property_infos = {}
+        for converter in (self.cls_converter, self.prop_converter):
+            if converter:
+                converter.update_context(context)
+
+    def update_context(self, context):
+        """Add the namespace/prefix and URI pairs of context to the current context"""
+        self._context.update(context)
+        self.context = self._context
+
     @property
     def validation(self):
         """Parse validation info from schema file"""
@@ -241,9 +339,16 @@ class Schema:
         if not self.base_schema_loaded:
             self.load_base_schema(base_schema=base_schema)
 
+        # the URIs of the user defined schema are interned on top of the (shared, not
+        # copied) base schema table, so each URI is a single string object across
+        # graphs, converters and validator
+        if self._processed_base_schema:
+            self.uri_table = UriTable(base=self._processed_base_schema.uri_table)
+        else:
+            self.uri_table = UriTable(self.base_schema_nx)
         if schema:
             # load JSON-LD file of user defined schema
-            self.schema = preprocess_schema(load_json_or_yaml(schema))
+            self.schema = preprocess_schema(load_json_or_yaml(schema), uri_table=self.uri_table)
         else:
             # set to an empty schema dictionary
             self.schema = {"@context": {}, "@graph": []}
@@ -265,43 +370,190 @@ class Schema:
         nx.set_node_attributes(self.schema_nx, attr_dict)
         self.full_schema = merge_schema(self.base_schema, self.schema)
         self.full_schema_nx = merge_schema_networkx(self.base_schema_nx, self.schema_nx)
+        # both self.schema and self.base_schema are already preprocessed
+        if self._processed_base_schema:
+            base_schema_index = self._processed_base_schema.index
+            base_class_set = self._processed_base_schema.class_set
+        else:
+            base_schema_index = base_class_set = None
         self.validator = SchemaValidator(
-            self.schema, self.full_schema_nx, self.base_schema, **self.validator_options
+            self.schema,
+            self.full_schema_nx,
+            self.base_schema,
+            preprocessed=True,
+            base_schema_index=base_schema_index,
+            base_class_set=base_class_set,
+            **self.validator_options,
         )
         self.validator.validate_full_schema()
 
-        # split the schema networkx into individual ones
-        isolates = list(nx.isolates(self.full_schema_nx))
-        self.extended_class_only_graph = self.schema_nx.subgraph(
+        # split the schema networkx into individual ones, materialized as new graphs,
+        # so the traversals don't go through the filters of subgraph views
+        isolates = set(nx.isolates(self.full_schema_nx))
+        self.extended_class_only_graph = build_subgraph(
+            self.schema_nx,
             [
                 node
                 for node, attrdict in self.schema_nx.nodes._nodes.items()
                 if attrdict.get("type") == "Class" and node not in isolates
-            ]
+            ],
+            backend=self.graph_backend,
         )
-        self.full_class_only_graph = self.full_schema_nx.subgraph(
+        self.full_class_only_graph = build_subgraph(
+            self.full_schema_nx,
             [
                 node
                 for node, attrdict in self.full_schema_nx.nodes._nodes.items()
                 if attrdict.get("type") == "Class"
-            ]
+            ],
+            backend=self.graph_backend,
         )
-        self.property_only_graph = self.full_schema_nx.subgraph(
+        self.property_only_graph = build_subgraph(
+            self.full_schema_nx,
             [
                 node
                 for node, attrdict in self.full_schema_nx.nodes._nodes.items()
                 if attrdict.get("type") == "Property"
-            ]
+            ],
+            backend=self.graph_backend,
         )
         # instantiate converters for classes and properties
         self._all_class_uris = [
             node
             for node, attrdict in self.full_schema_nx.nodes._nodes.items()
-            if attrdict.get("type") in ["Class", "DataType"]
+            if attrdict.get("type") in ("Class", "DataType")
         ]
         self.cls_converter = CurieUriConverter(self.context, self._all_class_uris)
         self._all_prop_uris = list(self.property_only_graph.nodes())
+        # hashed sets for the existence checks, next to the ordered lists
+        self._all_class_uri_set = frozenset(self._all_class_uris)
+        self._all_prop_uri_set = frozenset(self._all_prop_uris)
         self.prop_converter = CurieUriConverter(self.context, self._all_prop_uris)
+        if self.graph_backend == "frozen":
+            # the largest graph is only read after this point, store it compactly as well
+            self.full_schema_nx = FrozenDiGraph.from_networkx(self.full_schema_nx)
+            self.validator.schema_nx = self.full_schema_nx
+        # SchemaClass/SchemaProperty instances, see get_schema_item
+        self._schema_items = {}
+        # built on first use, reset each time the schema is (re)loaded
+        self._class_hierarchy = None
+        self._property_hierarchy = None
+        self._class_ancestors = None
+        self._inherited_properties = None
+        self._inherited_used_by = None
+        # the output records of the properties, see transform_property_info_list
+        self._property_infos = {}
+        if self.closure_index:
+            # build the closure indexes now, instead of on the first query
+            self._class_hierarchy = self.class_hierarchy
+            self._property_hierarchy = self.property_hierarchy
+
+    @property
+    def class_hierarchy(self):
+        """The HierarchyIndex of full_class_only_graph, e.g. its topological order,
+        root and the depth of each class. It's built once after the schema is loaded.
+        """
+        if self._class_hierarchy is None:
+            self._class_hierarchy = HierarchyIndex(
+                self.full_class_only_graph,
+                preferred_root=ROOT_CLASS,
+                closure=self.closure_index,
+            )
+        return self._class_hierarchy
+
+    @property
+    def property_hierarchy(self):
+        """The HierarchyIndex of property_only_graph"""
+        if self._property_hierarchy is None:
+            self._property_hierarchy = HierarchyIndex(
+                self.property_only_graph, closure=self.closure_index
+            )
+        return self._property_hierarchy
+
+    @property
+    def class_ancestors(self):
+        """Map each class URI to the list of its ancestors in breadth-first order (see
+        HierarchyIndex.ordered_ancestors), so its direct parents come first. It's built
+        once after the schema is loaded, on first use.
+        """
+        if self._class_ancestors is None:
+            self._class_ancestors = {
+                _class: self.class_hierarchy.ordered_ancestors(_class)
+                for _class in self.full_class_only_graph
+            }
+        return self._class_ancestors
+
+    def _inherit(self, attr):
+        """Map each class URI to a list of (class URI, attr value) tuples: the class
+        itself first, then its ancestors in class_ancestors order
+        """
+        nodes = self.full_class_only_graph.nodes
+        return {
+            _class: [(_uri, nodes[_uri].get(attr, [])) for _uri in [_class] + _ancestors]
+            for _class, _ancestors in self.class_ancestors.items()
+        }
+
+    @property
+    def inherited_properties(self):
+        """Map each class URI to the properties it has, directly or through inheritance
+
+        Each value is a list of (class URI, property records) tuples, one per class
+        contributing properties: the class itself first, then its ancestors (see
+        class_ancestors). It's built once after the schema is loaded, on the first
+        list_properties(class_specific=False) call.
+        """
+        if self._inherited_properties is None:
+            self._inherited_properties = self._inherit("properties")
+        return self._inherited_properties
+
+    @property
+    def inherited_used_by(self):
+        """Map each class URI to the records of the properties accepting it as a value,
+        i.e. whose range includes the class or one of its ancestors. The properties
+        of the class itself come first, then the ones of its ancestors, each record
+        once (a property redefined by the user schema has its own record).
+        """
+        if self._inherited_used_by is None:
+            self._inherited_used_by = {
+                _class: list(
+                    {
+                        id(_record): _record
+                        for _, _records in _groups
+                        for _record in _records
+                    }.values()
+                )
+                for _class, _groups in self._inherit("used_by").items()
+            }
+        return self._inherited_used_by
+
+    def used_by_many(self, class_names, inherited=True, output_type="PythonClass"):
+        """Return a list with the properties using each class of class_names as a value,
+        in the same format as SchemaClass.used_by
+
+        :arg list class_names: the classes, as URI, CURIE or label. If a label matches
+                               several classes, the properties of all of them are returned
+        :arg boolean inherited: also return the properties accepting an ancestor of the
+                                class as a value, see inherited_used_by
+        """
+        nodes = self.full_class_only_graph.nodes
+        results = []
+        for _uris in self.cls_converter.get_uris(class_names):
+            records = {}
+            for _uri in str2list(_uris):
+                if _uri not in nodes:
+                    continue
+                if inherited:
+                    _records = self.inherited_used_by.get(_uri, [])
+                else:
+                    _records = nodes[_uri].get("used_by", [])
+                records.update((id(_record), _record) for _record in _records)
+            if output_type == "uri":
+                results.append(list(records.values()))
+            else:
+                results.append(
+                    transform_property_info_list(self, list(records.values()), output_type)
+                )
+        return results
 
     def get_schema_namespace(self, schema):
         """
@@ -343,9 +595,19 @@ class Schema:
         Load base schema, defined in self.BASE_SCHEMA,
         but can be override in `base_schema` parameter.
         """
-        _base_schema = self.base_schema_loader.load(base_schema=base_schema)
-        self.base_schema = preprocess_schema(_base_schema)
-        self.base_schema_nx = load_schema_into_networkx(self.base_schema)
+        if hasattr(self.base_schema_loader, "load_processed"):
+            # shared with other Schema instances using the same base schemas,
+            # keep a reference to it so that it's kept in the registry
+            self._processed_base_schema = self.base_schema_loader.load_processed(
+                base_schema=base_schema
+            )
+            self.base_schema = self._processed_base_schema.schema
+            self.base_schema_nx = self._processed_base_schema.graph
+        else:
+            # a custom loader only providing the load method
+            _base_schema = self.base_schema_loader.load(base_schema=base_schema)
+            self.base_schema = preprocess_schema(_base_schema)
+            self.base_schema_nx = load_schema_into_networkx(self.base_schema)
         self.base_schema_loaded = True
 
     def full_schema_graph(self, size=None):
@@ -375,11 +637,7 @@ class Schema:
             parents.append(elements)
         # handle cases where user want to get all children
         if include_parents is False and include_children:
-            edges = list(
-                nx.edge_bfs(
-                    self.full_class_only_graph, [self.cls_converter.get_uri(source)]
-                )
-            )
+            edges = list(self.class_hierarchy.edge_bfs(self.cls_converter.get_uri(source)))
         # handle cases where user want to get all parents
         elif include_parents and include_children is False:
             edges = []
@@ -389,11 +647,7 @@ class Schema:
                     edges.append((_path[i], _path[i + 1]))
         # handle cases where user want to get both parents and children
         elif include_parents and include_children:
-            edges = list(
-                nx.edge_bfs(
-                    self.full_class_only_graph, [self.cls_converter.get_uri(source)]
-                )
-            )
+            edges = list(self.class_hierarchy.edge_bfs(self.cls_converter.get_uri(source)))
             for _path in parents:
                 _path.append(self.cls_converter.get_label(source))
                 for i in range(0, len(_path) - 1):
@@ -431,7 +685,7 @@ class Schema:
             for _item in self.schema["@graph"]
             if "@type" in _item
             and _item["@type"] == "rdfs:Class"
-            and _item["@id"] not in DATATYPES
+            and _item["@id"] not in DATATYPE_URIS
         ]
         classes = [SchemaClass(_cls, self) for _cls in classes]
         return classes
@@ -452,7 +706,7 @@ class Schema:
             for _item in self.schema["@graph"]
             if "@type" in _item
             and _item["@type"] == "rdfs:Class"
-            and _item["@id"] not in DATATYPES
+            and _item["@id"] not in DATATYPE_URIS
         ]
         reference_classes = [
             SchemaClass(_cls, self)
@@ -496,6 +750,51 @@ class Schema:
         else:
             return SchemaProperty(property_name, self, output_type)
 
+    @staticmethod
+    def _is_descendant_many(hierarchy, converter, pairs):
+        pairs = list(pairs)
+        names = list(dict.fromkeys(_name for _pair in pairs for _name in _pair))
+        uris = {_name: str2list(_uri) for _name, _uri in zip(names, converter.get_uris(names))}
+        return [
+            any(
+                (_child == _parent and _child in hierarchy.graph)
+                or hierarchy.is_descendant(_child, _parent)
+                for _child in uris[child]
+                for _parent in uris[parent]
+            )
+            for child, parent in pairs
+        ]
+
+    def is_subclass_of(self, child, parent):
+        """Return True if child is a subclass of parent (a class is a subclass of itself)
+
+        Both classes can be given as URI, CURIE or label. If a label matches several
+        classes, return True if any of them is a subclass of parent.
+        The answer comes from class_hierarchy, which builds an interval labelling of
+        the class hierarchy on the first call, so that the following calls don't
+        traverse the graph, even when closure_index is None. A hierarchy with
+        cycles can't be labelled, each call traverses the ancestors of child then.
+        """
+        return self.is_subclass_of_many([(child, parent)])[0]
+
+    def is_subclass_of_many(self, pairs):
+        """Return a list of booleans, one per (child, parent) tuple in pairs,
+        True if child is a subclass of parent, see is_subclass_of
+        """
+        return self._is_descendant_many(self.class_hierarchy, self.cls_converter, pairs)
+
+    def is_subproperty_of(self, child, parent):
+        """Return True if child is a subproperty of parent (a property is a subproperty
+        of itself), see is_subclass_of
+        """
+        return self.is_subproperty_of_many([(child, parent)])[0]
+
+    def is_subproperty_of_many(self, pairs):
+        """Return a list of booleans, one per (child, parent) tuple in pairs,
+        True if child is a subproperty of parent, see is_subproperty_of
+        """
+        return self._is_descendant_many(self.property_hierarchy, self.prop_converter, pairs)
+
     def generate_class_template(self):
         """Generate a template for schema class"""
         template = {
@@ -546,15 +845,55 @@ class Schema:
             json.dump(self.schema, f, sort_keys=True, indent=4, ensure_ascii=False)
 
 
+def get_schema_item(cls, name, schema, output_type):
+    """Return the SchemaClass/SchemaProperty (cls) instance of name from the schema cache
+
+    Instances of the defined classes/properties are cached per Schema, keyed by both
+    the given name and the URI, so all the names of a class share the same instance.
+    The undefined ones are not cached, so a warning is raised each time.
+    """
+    key = (cls, name, output_type)
+    item = schema._schema_items.get(key)
+    if item is None:
+        item = object.__new__(cls)
+        item._init(name, schema, output_type)
+        if item.defined_in_schema:
+            item = schema._schema_items.setdefault((cls, item.uri, output_type), item)
+            schema._schema_items[key] = item
+    return item
+
+
 class SchemaClass:
-    """Class representing an individual class in Schema"""
+    """Class representing an individual class in Schema
+
+    The instances are cached per Schema (see get_schema_item), so getting the same
+    class again returns the same object.
+    """
+
+    __slots__ = ("defined_in_schema", "se", "name", "output_type")
+
+    def __new__(cls, class_name, schema, output_type="PythonClass"):
+        return get_schema_item(cls, class_name, schema, output_type)
 
     def __init__(self, class_name, schema, output_type="PythonClass"):
+        # already initialized in __new__, or taken from the cache
+        pass
+
+    def __reduce__(self):
+        return self.__class__, (self.name, self.se, self.output_type)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _init(self, class_name, schema, output_type):
         self.defined_in_schema = True
         self.se = schema
         self.name = self.se.cls_converter.get_curie(class_name)
         # if class is not defined in schema, raise warning
-        if self.uri not in self.se._all_class_uris:
+        if self.uri not in self.se._all_class_uri_set:
             # raise ValueError('Class {} is not defined in Schema. Could not access it'.format(self.name))
             warnings.warn(
                 "Class {} is not defined in Schema. Could not access it".format(
@@ -584,83 +923,88 @@ class SchemaClass:
 
     @property
     def description(self):
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "description")
         if not response:
             return response
         # classes might not have descriptions
-        if "description" in self.se.full_class_only_graph.nodes._nodes[self.uri]:
-            return self.se.full_schema_nx.nodes._nodes[self.uri]["description"]
+        if "description" in self.se.full_class_only_graph.nodes[self.uri]:
+            return self.se.full_class_only_graph.nodes[self.uri]["description"]
         else:
             return None
 
     @property
     def child_classes(self):
         """Find schema classes that directly inherit from the given class"""
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "child_classes")
         if not response:
             return response
         children = self.se.full_class_only_graph.successors(self.uri)
-        result = restructure_output(
-            self, children, inspect.stack()[0][3], self.output_type
-        )
+        result = restructure_output(self, children, "child_classes", self.output_type)
         return result
 
     @property
     def descendant_classes(self):
         """Find schema classes that inherit from the given class"""
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "descendant_classes")
         if not response:
             return response
-        descendants = nx.descendants(self.se.full_class_only_graph, self.uri)
+        descendants = self.se.class_hierarchy.descendants(self.uri)
         result = restructure_output(
-            self, descendants, inspect.stack()[0][3], self.output_type
+            self, descendants, "descendant_classes", self.output_type
         )
         return result
 
     @property
     def ancestor_classes(self):
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "ancestor_classes")
         if not response:
             return response
-        ancestors = nx.ancestors(self.se.full_class_only_graph, self.uri)
+        ancestors = self.se.class_hierarchy.ancestors(self.uri)
         result = restructure_output(
-            self, ancestors, inspect.stack()[0][3], self.output_type
+            self, ancestors, "ancestor_classes", self.output_type
         )
         return result
 
     @property
     def parent_classes(self):
         """Find all parents of a specific class"""
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "parent_classes")
         if not response:
             return response
-
-        # Determine root
-        topo = list(nx.topological_sort(self.se.full_class_only_graph))
-        root_node = (
-            "http://schema.org/Thing" if "http://schema.org/Thing" in topo else topo[0]
-        )
-
-        # If the class is the root itself, it has no parents
-        if self.uri == root_node:
-            return []
-
-        # All paths from root to target; strip the target itself
-        raw_paths = list(
-            nx.all_simple_paths(
-                self.se.full_class_only_graph, source=root_node, target=self.uri
-            )
-        )
-
-        # Keep only paths with at least one parent node after stripping target
-        parent_paths = [p[:-1] for p in raw_paths if len(p) > 1]
-
-        if not parent_paths:
-            return []
-
-        return restructure_output(
-            self, parent_paths, inspect.stack()[0][3], self.output_type
-        )
+        hierarchy = self.se.class_hierarchy
+        # the root class itself has no parents
+        paths = [_path[:-1] for _path in hierarchy.iter_paths(hierarchy.root, self.uri)]
+        return restructure_output(self, paths, "parent_classes", self.output_type)
+
+    def iter_parent_classes(self, max_paths=None, max_depth=None):
+        """Lazily generate the paths from the root class to the parents of a class,
+        in the same order as parent_classes. The number of paths grows exponentially
+        with multi-inheritance, so use max_paths/max_depth to bound the enumeration.
+
+        :arg int max_paths: stop after generating max_paths paths
+        :arg int max_depth: only generate the paths with at most max_depth parent classes
+        """
+        if not check_defined(self, "parent_classes"):
+            return
+        hierarchy = self.se.class_hierarchy
+        # the root class itself has no parents
+        for _path in hierarchy.iter_paths(
+            hierarchy.root, self.uri, max_paths=max_paths, max_depth=max_depth
+        ):
+            yield restructure_output(self, [_path[:-1]], "parent_classes", self.output_type)[0]
+
+    def count_parent_paths(self):
+        """Count the paths from the root class to a class, without enumerating them"""
+        if not check_defined(self, "parent_classes"):
+            return 0
+        hierarchy = self.se.class_hierarchy
+        return hierarchy.count_paths(hierarchy.root, self.uri)
+
+    def ancestor_graph(self):
+        """Return the DAG (networkx.DiGraph of URIs) formed by a class and all its ancestors"""
+        if not check_defined(self, "ancestor_classes"):
+            return nx.DiGraph()
+        return self.se.class_hierarchy.ancestor_graph(self.uri)
 
     def list_properties(self, class_specific=True, group_by_class=True):
         """Find properties of a class
@@ -668,38 +1012,22 @@ class SchemaClass:
         :arg boolean class_specific: specify whether only to return class specific properties or not
         :arg boolean group_by_class: specify whether the output should be grouped by class or not
         """
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "list_properties")
         if not response:
             return response
+        if class_specific:
+            nodes = self.se.full_class_only_graph.nodes
+            groups = [
+                (self.uri, nodes[self.uri].get("properties", []) if self.uri in nodes else [])
+            ]
+        else:
+            groups = self.se.inherited_properties.get(self.uri, [(self.uri, [])])
         properties = [
-            {
-                "class": self.name,
-                "properties": self.se.full_class_only_graph.nodes[self.uri][
-                    "properties"
-                ],
-            }
+            {"class": _class, "properties": _properties} for _class, _properties in groups
         ]
-        if not class_specific:
-            # find all parent classes
-            if self.output_type == "PythonClass":
-                parents = [_item.uri for _item in self.ancestor_classes]
-            else:
-                parents = [
-                    self.se.cls_converter.get_uri(_item)
-                    for _item in self.ancestor_classes
-                ]
-            # update properties, each dict represent properties associated with the class
-            for _parent in parents:
-                properties.append(
-                    {
-                        "class": _parent,
-                        "properties": self.se.full_class_only_graph.nodes[_parent][
-                            "properties"
-                        ],
-                    }
-                )
+        properties[0]["class"] = self.name
         result = restructure_output(
-            self, properties, inspect.stack()[0][3], self.output_type
+            self, properties, "list_properties", self.output_type
         )
         if group_by_class:
             return result
@@ -709,16 +1037,21 @@ class SchemaClass:
                 ungrouped_properties += _item["properties"]
             return ungrouped_properties
 
-    def used_by(self):
-        """Find where a given class is used as a value of a property"""
-        response = check_defined(self, inspect.stack()[0][3])
+    def used_by(self, inherited=False):
+        """Find where a given class is used as a value of a property
+
+        :arg boolean inherited: also return the properties accepting an ancestor of
+                                the class as a value, see Schema.inherited_used_by
+        """
+        response = check_defined(self, "used_by")
         if not response:
             return response
+        if inherited:
+            response = self.se.inherited_used_by.get(self.uri, [])
+            return restructure_output(self, response, "used_by", self.output_type)
         if "used_by" in self.se.full_class_only_graph.nodes[self.uri]:
             response = self.se.full_class_only_graph.nodes[self.uri]["used_by"]
-            result = restructure_output(
-                self, response, inspect.stack()[0][3], self.output_type
-            )
+            result = restructure_output(self, response, "used_by", self.output_type)
             return result
         else:
             return []
@@ -729,7 +1062,7 @@ class SchemaClass:
 
     def describe(self):
         """Find details about a specific schema class"""
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "describe")
         if not response:
             return response
         class_info = {
@@ -765,14 +1098,36 @@ class SchemaClass:
 
 
 class SchemaProperty:
-    """Class representing an individual property in Schema"""
+    """Class representing an individual property in Schema
+
+    The instances are cached per Schema (see get_schema_item), so getting the same
+    property again returns the same object.
+    """
+
+    __slots__ = ("defined_in_schema", "se", "name", "output_type")
+
+    def __new__(cls, property_name, schema, output_type="PythonClass"):
+        return get_schema_item(cls, property_name, schema, output_type)
 
     def __init__(self, property_name, schema, output_type="PythonClass"):
+        # already initialized in __new__, or taken from the cache
+        pass
+
+    def __reduce__(self):
+        return self.__class__, (self.name, self.se, self.output_type)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _init(self, property_name, schema, output_type):
         self.defined_in_schema = True
         self.se = schema
         self.name = self.se.prop_converter.get_curie(property_name)
         # if property is not defined in schema, raise ValueError
-        if self.uri not in self.se.property_only_graph:
+        if self.uri not in self.se._all_prop_uri_set:
             # raise ValueError('Property {} is not defined in Schema. Could not access it'.format(self.name))
             warnings.warn(
                 "Property {} is not defined in Schema. Could not access it".format(
@@ -790,28 +1145,24 @@ class SchemaProperty:
 
     @property
     def domain(self):
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "domain")
         if not response:
             return response
         if "domain" in self.se.property_only_graph.nodes[self.uri]:
             _domain = self.se.property_only_graph.nodes[self.uri]["domain"]
-            result = restructure_output(
-                self, _domain, inspect.stack()[0][3], self.output_type
-            )
+            result = restructure_output(self, _domain, "domain", self.output_type)
             return result
         else:
             return []
 
     @property
     def range(self):
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "range")
         if not response:
             return response
         if "range" in self.se.property_only_graph.nodes[self.uri]:
             _range = self.se.property_only_graph.nodes[self.uri]["range"]
-            result = restructure_output(
-                self, _range, inspect.stack()[0][3], self.output_type
-            )
+            result = restructure_output(self, _range, "range", self.output_type)
             return result
         else:
             return []
@@ -830,54 +1181,54 @@ class SchemaProperty:
 
     @property
     def description(self):
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "description")
         if not response:
             return response
         # some properties doesn't have descriptions
-        if "description" in self.se.property_only_graph.nodes._nodes[self.uri]:
-            return self.se.property_only_graph.nodes._nodes[self.uri]["description"]
+        if "description" in self.se.property_only_graph.nodes[self.uri]:
+            return self.se.property_only_graph.nodes[self.uri]["description"]
         else:
             return None
 
     @property
     def parent_properties(self):
         """Find all parents of a specific class"""
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "parent_properties")
         if not response:
             return response
-        parents = nx.ancestors(self.se.property_only_graph, self.uri)
+        parents = self.se.property_hierarchy.ancestors(self.uri)
         result = restructure_output(
-            self, parents, inspect.stack()[0][3], self.output_type
+            self, parents, "parent_properties", self.output_type
         )
         return result
 
     @property
     def child_properties(self):
         """Find schema properties that directly inherit from the given property"""
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "child_properties")
         if not response:
             return response
         children = self.se.property_only_graph.successors(self.uri)
         result = restructure_output(
-            self, children, inspect.stack()[0][3], self.output_type
+            self, children, "child_properties", self.output_type
         )
         return result
 
     @property
     def descendant_properties(self):
         """Find schema properties that inherit from the given property"""
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "descendant_properties")
         if not response:
             return response
-        descendants = nx.descendants(self.se.property_only_graph, self.uri)
+        descendants = self.se.property_hierarchy.descendants(self.uri)
         result = restructure_output(
-            self, descendants, inspect.stack()[0][3], self.output_type
+            self, descendants, "descendant_properties", self.output_type
         )
         return result
 
     @property
     def inverse_property(self):
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "inverse_property")
         if not response:
             return response
         inverse = self.se.property_only_graph.node[self.uri]["inverse"]
@@ -888,7 +1239,7 @@ class SchemaProperty:
 
     def describe(self):
         """Find details about a specific property"""
-        response = check_defined(self, inspect.stack()[0][3])
+        response = check_defined(self, "describe")
         if not response:
             return response
         property_info = {
@@ -1,3 +1,5 @@
+import os
+
 BASE_SCHEMA = ["schema.org", "bioschemas"]
 # This is a list of namespaces commonly used in @context when defining the schema
 # We skip these as the base schemas to load
@@ -14,6 +16,22 @@ SCHEMAORG_VERSION_URL = "https://api.github.com/repos/schemaorg/schemaorg/releas
 # We should update this version after we tested a recent version.
 SCHEMAORG_DEFAULT_VERSION = "29.3"
 
+# Local directory for the on-disk cache of downloaded schema.org releases, so that a
+# new process does not need to download the same release again.
+# It can be overridden by the BIOTHINGS_SCHEMA_CACHE_DIR environment variable,
+# set it to an empty string to disable the on-disk cache.
+SCHEMA_CACHE_DIR = os.environ.get(
+    "BIOTHINGS_SCHEMA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "biothings_schema"),
+)
+# The max total size (in bytes) of the on-disk cache, the least recently used
+# files are evicted first when the limit is exceeded.
+SCHEMA_CACHE_MAX_SIZE = 512 * 1024 * 1024  # 512MB
+# If True, never access the network to load schema.org, only the releases
+# available in the on-disk cache are used. Can also be turned on by setting
+# the BIOTHINGS_SCHEMA_OFFLINE environment variable to "1" or "true".
+SCHEMAORG_OFFLINE = os.environ.get("BIOTHINGS_SCHEMA_OFFLINE", "").lower() in ("1", "true", "yes")
+
 DDE_SCHEMA_BASE_URL = "https://discovery.biothings.io/api/registry/"
 
 DATATYPES = [
@@ -35,6 +53,9 @@ DATATYPES = [
 
 IGNORED_CLASS_PROPERTY = ["rdfs:Class", "rdf:type", "rdfs:label"]
 
+# the root class of the class hierarchy
+ROOT_CLASS = "http://schema.org/Thing"
+
 # the field name contains JSON-Schema based validation rules
 VALIDATION_FIELD = "$validation"
 # a list of alternative validation fields for back-compatibility
@@ -1,6 +1,12 @@
+import glob
+import hashlib
 import json
+import os
+import tempfile
+import warnings
 from copy import copy
 from functools import lru_cache, wraps
+from time import time
 
 try:
     from time import monotonic_ns  # For Python >=3.7
@@ -43,6 +49,30 @@ def find_duplicates_0(_list):
     return set([x for x in _list if _list.count(x) > 1])
 
 
+def freeze_json(value):
+    """Return a hashable structural key of a JSON value
+
+    Two values get the same key if and only if json.dumps(value, sort_keys=True)
+    gives the same string, e.g. the key order of dicts is ignored, but 1, 1.0 and
+    True are different values. Raise TypeError for a value that's not JSON data.
+    """
+    if isinstance(value, str):
+        return ("str", value)
+    elif value is None or isinstance(value, bool):
+        return value
+    elif isinstance(value, int):
+        return ("int", value)
+    elif isinstance(value, float):
+        return ("float", repr(value))
+    elif isinstance(value, (list, tuple)):
+        return ("list", tuple(freeze_json(_item) for _item in value))
+    elif isinstance(value, dict):
+        if not all(isinstance(_key, str) for _key in value):
+            raise TypeError("JSON object keys should be str")
+        return ("dict", tuple(sorted((_key, freeze_json(_val)) for _key, _val in value.items())))
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON data")
+
+
 def find_duplicates(_list):
     """a more efficient way to return duplicated items
     ref: https://www.iditect.com/guide/python/python_howto_find_the_duplicates_in_a_list.html
@@ -160,3 +190,115 @@ def timed_lru_cache(_func=None, *, seconds: int = 600, maxsize: int = 128, typed
         return wrapper_cache
     else:
         return wrapper_cache(_func)
+
+
+class FileCache:
+    """A simple content-addressed, size-bounded on-disk cache
+
+    Each entry is stored as "<key>.<sha256 digest of the content><suffix>" under
+    cache_dir, so a truncated or modified file is detected and ignored on read.
+    Files are written atomically (write to a temp file, then rename), and the
+    least recently used files are evicted once the total size exceeds max_size.
+
+    :arg str cache_dir: the directory to store the cached files
+    :arg int max_size: the max total size (in bytes) of the cache, None for no limit
+    """
+
+    DIGEST_LENGTH = 16
+
+    def __init__(self, cache_dir, max_size=None):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def _find(self, key, suffix):
+        """Return a list of (path, digest) tuples of the files cached for key"""
+        pattern = glob.escape(key) + "." + "[0-9a-f]" * self.DIGEST_LENGTH + glob.escape(suffix)
+        return [
+            (path, os.path.basename(path)[len(key) + 1 : len(key) + 1 + self.DIGEST_LENGTH])
+            for path in glob.glob(os.path.join(glob.escape(self.cache_dir), pattern))
+        ]
+
+    @classmethod
+    def _digest(cls, data):
+        return hashlib.sha256(data).hexdigest()[: cls.DIGEST_LENGTH]
+
+    def get(self, key, suffix=".json", max_age=None):
+        """Return the cached content (bytes) of key, or None if not cached
+
+        :arg int max_age: if set, ignore the cached file older than max_age seconds
+        """
+        for path, digest in self._find(key, suffix):
+            try:
+                if max_age is not None and time() - os.path.getmtime(path) > max_age:
+                    continue
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+            if self._digest(data) != digest:
+                # corrupted or partially written by a third party, discard it
+                self._remove(path)
+                continue
+            if max_age is None:
+                try:
+                    os.utime(path)  # mark as recently used for the LRU eviction
+                except OSError:
+                    pass
+            return data
+        return None
+
+    def set(self, key, data, suffix=".json"):
+        """Atomically store data (bytes) under key, return the path of the cached file"""
+        path = os.path.join(self.cache_dir, f"{key}.{self._digest(data)}{suffix}")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                self._remove(tmp_path)
+                raise
+        except OSError as err:
+            warnings.warn(f"Failed to write cache file {path}: {err}")
+            return None
+        # remove the stale entries of the same key
+        for _path, _ in self._find(key, suffix):
+            if _path != path:
+                self._remove(_path)
+        self.evict()
+        return path
+
+    def keys(self, suffix=".json"):
+        """Return the list of keys currently in the cache"""
+        pattern = "*." + "[0-9a-f]" * self.DIGEST_LENGTH + glob.escape(suffix)
+        return [
+            os.path.basename(path)[: -(self.DIGEST_LENGTH + 1 + len(suffix))]
+            for path in glob.glob(os.path.join(glob.escape(self.cache_dir), pattern))
+        ]
+
+    def evict(self):
+        """Remove the least recently used files until the total size is within max_size"""
+        if self.max_size is None:
+            return
+        entries = []
+        for path in glob.glob(os.path.join(glob.escape(self.cache_dir), "*")):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(_size for _, _size, _ in entries)
+        for _, _size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= _size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
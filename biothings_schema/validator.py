@@ -1,12 +1,16 @@
 import jsonschema
 import networkx as nx
-import json
 import copy
+from collections import deque
 
-from .curies import extract_name_from_uri_or_curie, preprocess_schema
+from .curies import extract_name_from_uri_or_curie, index_schema, preprocess_schema
 from .dataload import load_base_schema
-from .settings import VALIDATION_FIELD  # ALT_VALIDATION_FIELDS,; DEFAULT_JSONSCHEMA_METASCHEMA
-from .utils import dict2list, find_duplicates, str2list
+from .hierarchy import HierarchyIndex
+from .settings import (
+    ROOT_CLASS,
+    VALIDATION_FIELD,
+)  # ALT_VALIDATION_FIELDS,; DEFAULT_JSONSCHEMA_METASCHEMA
+from .utils import dict2list, find_duplicates, freeze_json
 from .validator_schemas import class_json_schema, property_json_schema, schema_org_json_schema
 
 
@@ -90,18 +94,50 @@ class SchemaValidator:
         base_schema=None,
         validation_merge=False,
         raise_on_validation_error=True,
+        preprocessed=False,
+        base_schema_index=None,
+        base_class_set=None,
     ):
+        """
+        :arg bool preprocessed: set to True if schema and base_schema are already
+                                processed by preprocess_schema, so they are not processed again
+        :arg dict base_schema_index: the index of the preprocessed base schema as returned
+                                     by index_schema, if provided, base_schema is ignored
+        :arg frozenset base_class_set: the frozenset of the classes of the base schema index,
+                                       shared with other validators, built if not provided
+        """
         self.validation_merge = validation_merge
-        if base_schema is None or isinstance(base_schema, (list, tuple)):
-            base_schema = load_base_schema(base_schema=base_schema)
-
-        self.base_schema = self._process_schema(base_schema)
-        self.extension_schema = self._process_schema(schema)
-        self.all_classes = self.base_schema["classes"] + self.extension_schema["classes"]
+        if base_schema_index is not None:
+            self.base_schema = base_schema_index
+        else:
+            if base_schema is None or isinstance(base_schema, (list, tuple)):
+                base_schema = load_base_schema(base_schema=base_schema)
+                preprocessed_base = False
+            else:
+                preprocessed_base = preprocessed
+            self.base_schema = self._process_schema(base_schema, preprocessed=preprocessed_base)
+        self.extension_schema = self._process_schema(schema, preprocessed=preprocessed)
+        # for the existence checks of the classes
+        if base_class_set is None:
+            base_class_set = frozenset(self.base_schema["classes"])
+        if self.extension_schema["classes"]:
+            self.all_class_set = base_class_set.union(self.extension_schema["classes"])
+        else:
+            self.all_class_set = base_class_set
         self.all_schemas = (
             self.base_schema["schema"]["@graph"] + self.extension_schema["schema"]["@graph"]
         )
         self.schema_nx = schema_nx
+        # built on first use, see records_by_label and get_label_domains
+        self._records_by_label = None
+        self._label_domains = {}
+        # built on first use, see get_root_path_classes
+        self._root_descendants = None
+        self._root_path_classes = {}
+        # built on first use, see get_norm_id_index
+        self._norm_id_index = None
+        # the structural keys of the merged list items, see _merge_lists
+        self._frozen_items = {}
 
         self.validation_errors = []  # store all validation errors
         self.raise_on_validation_error = (
@@ -109,16 +145,64 @@ class SchemaValidator:
         )
 
     @staticmethod
-    def _process_schema(schema):
-        _schema = {"schema": preprocess_schema(schema), "classes": [], "properties": []}
-        for _record in _schema["schema"]["@graph"]:
-            if "@type" in _record:
-                _type = str2list(_record["@type"])
-                if "rdfs:Property" in _type:
-                    _schema["properties"].append(_record["@id"])
-                elif "rdfs:Class" in _type:
-                    _schema["classes"].append(_record["@id"])
-        return _schema
+    def _process_schema(schema, preprocessed=False):
+        if not preprocessed:
+            schema = preprocess_schema(schema)
+        return index_schema(schema)
+
+    @property
+    def all_classes(self):
+        """The list of the classes of the base schema, then of the extension schema"""
+        return self.base_schema["classes"] + self.extension_schema["classes"]
+
+    @property
+    def records_by_label(self):
+        """Map each rdfs:label to the records of all_schemas with this label"""
+        if self._records_by_label is None:
+            self._records_by_label = {}
+            for _record in self.all_schemas:
+                self._records_by_label.setdefault(_record["rdfs:label"], []).append(_record)
+        return self._records_by_label
+
+    def get_label_domains(self, label):
+        """Return the set of domainIncludes classes of the records labeled label"""
+        domains = self._label_domains.get(label)
+        if domains is None:
+            domains = self._label_domains[label] = frozenset(
+                cls["@id"]
+                for _record in self.records_by_label.get(label, [])
+                for cls in dict2list(_record["http://schema.org/domainIncludes"])
+            )
+        return domains
+
+    def get_root_path_classes(self, _id):
+        """Return the frozenset of the classes on a path from the root class to _id (both
+        included), or an empty set if _id has no path to the root class.
+
+        It's the intersection of the ancestors of _id with the descendants of the
+        root class (computed once per validator), so the paths are not enumerated.
+        Raise networkx.NodeNotFound if the root class or _id is not in schema_nx.
+        """
+        classes = self._root_path_classes.get(_id)
+        if classes is None:
+            for node in (ROOT_CLASS, _id):
+                if node not in self.schema_nx:
+                    raise nx.NodeNotFound(f"node {node} not in graph")
+            # HierarchyIndex only uses the successors/predecessors methods of the graph,
+            # so schema_nx can also be a FrozenDiGraph
+            hierarchy = HierarchyIndex(self.schema_nx)
+            if self._root_descendants is None:
+                self._root_descendants = hierarchy.descendants(ROOT_CLASS)
+            if _id == ROOT_CLASS:
+                classes = frozenset([_id])
+            elif _id in self._root_descendants:
+                classes = frozenset(
+                    (hierarchy.ancestors(_id) & self._root_descendants) | {ROOT_CLASS, _id}
+                )
+            else:
+                classes = frozenset()
+            self._root_path_classes[_id] = classes
+        return classes
 
     def report_validation_error(self, err_msg, **kwargs):
         """Report valiation error, either keep it in self.validation_errors or raise an exception.
@@ -161,7 +245,7 @@ class SchemaValidator:
         """Check if the value of "subclassof" is included in the schema file"""
         subclassof_value = dict2list(subclassof_value)
         for record in subclassof_value:
-            if record["@id"] not in self.all_classes:
+            if record["@id"] not in self.all_class_set:
                 # raise KeyError('Value of subclassof : {} is not defined in the schema.'.format(record["@id"]))
                 self.report_validation_error(
                     "Value of subclassof : {} is not defined in the schema.".format(record["@id"])
@@ -173,7 +257,7 @@ class SchemaValidator:
         if domainincludes_value:
             domainincludes_value = dict2list(domainincludes_value)
             for cls in domainincludes_value:
-                if cls["@id"] not in self.all_classes:
+                if cls["@id"] not in self.all_class_set:
                     # raise KeyError('Value of domainincludes: {} is not defined in the schema.'.format(cls["@id"]))
                     self.report_validation_error(
                         f"Value of domainincludes: \"{cls['@id']}\" is not defined in the schema.",
@@ -195,7 +279,7 @@ class SchemaValidator:
         if rangeincludes_value:
             rangeincludes_value = dict2list(rangeincludes_value)
             for cls in rangeincludes_value:
-                if cls["@id"] not in self.all_classes:
+                if cls["@id"] not in self.all_class_set:
                     # raise KeyError('Value of rangeincludes: {} is not defined in the schema.'.format(cls["@id"]))
                     self.report_validation_error(
                         f"Value of rangeincludes: \"{cls['@id']}\" is not defined in the schema.",
@@ -300,14 +384,7 @@ class SchemaValidator:
                 self.validate_json_schema(record[VALIDATION_FIELD])
                 properties = record[VALIDATION_FIELD]["properties"].keys()
                 # find all parents of the class
-                paths = nx.all_simple_paths(
-                    self.schema_nx, source="http://schema.org/Thing", target=_id
-                )
-                # print(f"{_id}: {nx.ancestors(self.schema_nx, _id)}")      # a useful debug line in case needed
-                parent_classes = set()
-                for _path in paths:
-                    for _item in _path:
-                        parent_classes.add(_item)
+                parent_classes = self.get_root_path_classes(_id)
                 if not parent_classes:
                     # raise ValueError(f'Class "{_id}" has no path to the root "schema:Thing" class')
                     self.report_validation_error(
@@ -318,16 +395,7 @@ class SchemaValidator:
                 # loop through all properties and check if the value of
                 # domainIncludes belong to one of the parent_classes
                 for _property in properties:
-                    matched = False
-                    for _record in self.all_schemas:
-                        if _record["rdfs:label"] == _property:
-                            domainincludes_value = dict2list(
-                                _record["http://schema.org/domainIncludes"]
-                            )
-                            for cls in domainincludes_value:
-                                if cls["@id"] in parent_classes:
-                                    matched = True
-                    if not matched:
+                    if self.get_label_domains(_property).isdisjoint(parent_classes):
                         # raise ValueError(f'field "{_property}" in "{VALIDATION_FIELD}" is not defined in this class or any of its parent classes')
                         self.report_validation_error(
                             f'field "{_property}" in "{VALIDATION_FIELD}" is not defined in this class or any of its parent classes',
@@ -358,24 +426,35 @@ class SchemaValidator:
         _id = _id.replace("https://www.schema.org/", "https://schema.org/")
         return _id.rstrip("/")
 
+    def _freeze_item(self, item):
+        """Return the structural key of a list item (see freeze_json), cached per object.
+        merge never modifies the items of the lists, so their keys don't change.
+        """
+        frozen = self._frozen_items.get(id(item))
+        if frozen is None:
+            try:
+                key = freeze_json(item)
+            except TypeError:
+                # Fallback if something isn’t JSON-serializable
+                key = ("object", str(item))
+            # keep a reference to the item, so its id is not reused
+            frozen = self._frozen_items[id(item)] = (item, key)
+        return frozen[1]
+
     def _merge_lists(self, left, right):
         """
         Merges two lists into one, removing duplicates.
         """
         if not left:
             return list(right)
-        # If any element is a dict/list, use JSON string as a stable key
-        complex_items = any(isinstance(x, (dict, list)) for x in left + right)
+        items = left + right
+        # If any element is a dict/list, compare the items structurally
+        if any(isinstance(x, (dict, list)) for x in items):
+            markers = map(self._freeze_item, items)
+        else:
+            markers = items
         out, seen = [], set()
-        for item in left + right:
-            if complex_items:
-                try:
-                    marker = json.dumps(item, sort_keys=True)
-                except TypeError:
-                    # Fallback if something isn’t JSON-serializable
-                    marker = str(item)
-            else:
-                marker = item
+        for item, marker in zip(items, markers):
             if marker in seen:
                 continue
             seen.add(marker)
@@ -405,39 +484,46 @@ class SchemaValidator:
                 self.extension_schema["schema"]["@graph"][schema_index][VALIDATION_FIELD],
             )
 
-    def merge_recursive_parents(self, record, schema_index, visited=None):
-        if visited is None:
-            visited = set()
-
+    def get_norm_id_index(self):
+        """Map each normalized @id (see _norm_id) to the index of its first record in
+        the extension schema @graph. It's built once per validator.
+        """
+        if self._norm_id_index is None:
+            self._norm_id_index = {}
+            for idx, schema in enumerate(self.extension_schema["schema"]["@graph"]):
+                self._norm_id_index.setdefault(self._norm_id(schema.get("@id")), idx)
+        return self._norm_id_index
+
+    def get_parent_indexes(self, record):
+        """Return the indexes in the extension schema @graph of the parents of record,
+        in rdfs:subClassOf order, without duplicates
+        """
         subclass_of = record.get("rdfs:subClassOf")
         if not subclass_of:
-            return
-
+            return []
         if isinstance(subclass_of, dict):
             subclass_of = [subclass_of]
-
-        graph = self.extension_schema["schema"]["@graph"]
-
+        norm_id_index = self.get_norm_id_index()
+        parent_indexes = []
         for parent_ref in subclass_of:
-            raw_parent_id = parent_ref.get("@id")
-            parent_id = self._norm_id(raw_parent_id)
-            if not parent_id or parent_id in visited:
-                continue
+            parent_id = self._norm_id(parent_ref.get("@id"))
+            parent_index = norm_id_index.get(parent_id) if parent_id else None
+            if parent_index is not None and parent_index not in parent_indexes:
+                parent_indexes.append(parent_index)
+        return parent_indexes
 
-            visited.add(parent_id)
+    def merge_recursive_parents(self, record, schema_index, visited=None):
+        if visited is None:
+            visited = set()
 
-            parent_index = next(
-                (
-                    idx
-                    for idx, schema in enumerate(graph)
-                    if self._norm_id(schema.get("@id")) == parent_id
-                ),
-                None,
-            )
+        graph = self.extension_schema["schema"]["@graph"]
 
-            if parent_index is None:
+        for parent_index in self.get_parent_indexes(record):
+            if parent_index in visited:
                 continue
 
+            visited.add(parent_index)
+
             parent_schema = graph[parent_index]
 
             self.merge_parent_validations(record, schema_index, parent_schema)
@@ -445,9 +531,53 @@ class SchemaValidator:
             # Recurse up the tree
             self.merge_recursive_parents(parent_schema, schema_index, visited)
 
+    def merge_all_recursive_parents(self):
+        """Merge the validations of all the parent classes into each class, the same
+        way as calling merge_recursive_parents on each class.
+
+        The records are merged in topological order, each one from the already merged
+        validations of its direct parents, so the validation of a shared ancestor is
+        not merged again for each of its descendants. The records in or below a
+        subClassOf cycle are merged with merge_recursive_parents.
+        """
+        graph = self.extension_schema["schema"]["@graph"]
+        parents = [self.get_parent_indexes(record) for record in graph]
+        children = [[] for _ in graph]
+        indegree = [0] * len(graph)
+        for idx, parent_indexes in enumerate(parents):
+            for parent_index in parent_indexes:
+                children[parent_index].append(idx)
+                indegree[idx] += 1
+        # the merged validation of each record, None if it has none
+        merged = [None] * len(graph)
+        queue = deque(idx for idx in range(len(graph)) if not indegree[idx])
+        while queue:
+            idx = queue.popleft()
+            record = graph[idx]
+            validation = record.get(VALIDATION_FIELD)
+            parent_validations = [merged[_idx] for _idx in parents[idx] if merged[_idx]]
+            if validation is not None and record["@type"] == "rdfs:Class":
+                merged[idx] = validation
+            elif parent_validations:
+                # not written to the record, only merged into its descendants
+                merged[idx] = self.merge(validation, {}) if validation else {}
+            else:
+                merged[idx] = validation
+            for parent_validation in parent_validations:
+                self.merge(parent_validation, merged[idx])
+            for child in children[idx]:
+                indegree[child] -= 1
+                if not indegree[child]:
+                    queue.append(child)
+        for idx, record in enumerate(graph):
+            if indegree[idx] and VALIDATION_FIELD in record and record["@type"] == "rdfs:Class":
+                self.merge_recursive_parents(record, idx)
+
     def validate_full_schema(self):
         """Main function to validate schema"""
         self.check_duplicate_labels()
+        if self.validation_merge:
+            self.merge_all_recursive_parents()
         for count, record in enumerate(self.extension_schema["schema"]["@graph"]):
             self.check_whether_atid_and_label_match(record)
             if record["@type"] == "rdfs:Class":
@@ -455,9 +585,6 @@ class SchemaValidator:
                 # if record.get('rdfs:subClassOf'):
                 #     parent_schema = next((schema for schema in self.extension_schema['schema']['@graph']
                 #                           if schema['@id'] == record.get('rdfs:subClassOf').get('@id')), None)
-                if self.validation_merge:
-                    self.merge_recursive_parents(record, count)
-
                 # self.merge_parent_validations(record, count, parent_schema)
                 self.validate_class_schema(record)
                 self.validate_class_label(record["@id"])
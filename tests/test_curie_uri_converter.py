@@ -1,6 +1,11 @@
 import unittest
 
-from biothings_schema.curies import CurieUriConverter
+from biothings_schema.curies import (
+    CurieUriConverter,
+    UriTable,
+    determine_id_type,
+    preprocess_schema,
+)
 
 CONTEXT = {
     "schema": "http://schema.org/",
@@ -28,6 +33,11 @@ class TestCurieUriConverter(unittest.TestCase):
         self.assertEqual(self.converter.determine_id_type("http://schema.org/Gene"), "url")
         self.assertEqual(self.converter.determine_id_type("Gene"), "name")
         self.assertEqual(self.converter.determine_id_type("schema:Gene:Gene"), "name")
+        # the classification is memoized
+        determine_id_type.cache_clear()
+        self.converter.determine_id_type("schema:Gene")
+        self.converter.determine_id_type("schema:Gene")
+        self.assertEqual(determine_id_type.cache_info().hits, 1)
 
     def test_get_uri(self):
         """Test get_uri function"""
@@ -48,6 +58,42 @@ class TestCurieUriConverter(unittest.TestCase):
         self.assertEqual(set(self.converter.get_curie("Gene")), set(["bts:Gene", "schema:Gene"]))
         self.assertEqual(self.converter.get_curie("schema:Thing"), "schema:Thing")
         self.assertEqual(self.converter.get_curie("Person"), "schema:Person")
+        self.assertEqual(
+            self.converter.get_curie("http://example.org/Thing"), "http://example.org/Thing"
+        )
+
+    def test_batch_conversion(self):
+        """Test the batch conversion functions"""
+        inputs = ["http://schema.org/Thing", "schema:Person", "http://schema.org/Thing"]
+        self.assertEqual(
+            self.converter.get_curies(inputs), ["schema:Thing", "schema:Person", "schema:Thing"]
+        )
+        self.assertEqual(self.converter.get_labels(iter(inputs)), ["Thing", "Person", "Thing"])
+        self.assertEqual(self.converter.get_prefixes(inputs), ["schema", "schema", "schema"])
+        self.assertEqual(
+            self.converter.get_uris(["schema:Thing", "Person"]),
+            ["http://schema.org/Thing", "http://schema.org/Person"],
+        )
+        self.assertEqual(self.converter.get_curies([]), [])
+
+    def test_namespace_not_ending_with_slash(self):
+        """Test the longest namespace matching, e.g. namespaces ending with #"""
+        converter = CurieUriConverter(
+            dict(CONTEXT, rdfs="http://www.w3.org/2000/01/rdf-schema#"), URI_LIST
+        )
+        uri = "http://www.w3.org/2000/01/rdf-schema#label"
+        self.assertEqual(converter.get_curie(uri), "rdfs:label")
+        self.assertEqual(converter.get_prefix(uri), "rdfs")
+        self.assertIsNone(self.converter.get_prefix(uri))
+
+    def test_update_context(self):
+        """Test the namespace index is updated with the context"""
+        context = dict(CONTEXT)
+        converter = CurieUriConverter(context, URI_LIST)
+        context["ex"] = "http://example.org/"
+        converter.update_context(context)
+        self.assertEqual(converter.get_curie("http://example.org/Thing"), "ex:Thing")
+        self.assertEqual(converter.get_prefix("http://example.org/Thing"), "ex")
 
     def test_get_label(self):
         """Test get_label function"""
@@ -56,5 +102,49 @@ class TestCurieUriConverter(unittest.TestCase):
         self.assertEqual(self.converter.get_label("schema:Thing"), "Thing")
 
 
+class TestUriTable(unittest.TestCase):
+    """Test UriTable Class"""
+
+    def test_intern(self):
+        table = UriTable(["http://schema.org/Thing"])
+        uri = "".join(["http://schema.org/", "Person"])
+        self.assertIs(table.intern(uri), uri)
+        self.assertIs(table.intern("".join(["http://schema.org/", "Person"])), uri)
+        self.assertIs(table.get("".join(["http://schema.org/", "Person"])), uri)
+        self.assertEqual(len(table), 2)
+        self.assertNotIn("http://schema.org/Gene", table)
+        self.assertIsNone(table.get("http://schema.org/Gene"))
+
+    def test_base(self):
+        base = UriTable(["http://schema.org/Thing"])
+        table = UriTable(base=base)
+        thing = base.get("http://schema.org/Thing")
+        # the URIs of the base table are not copied, and the base table is not modified
+        self.assertIs(table.intern("".join(["http://schema.org/", "Thing"])), thing)
+        table.intern("http://schema.org/Gene")
+        self.assertEqual(table.uris, {"http://schema.org/Gene": "http://schema.org/Gene"})
+        self.assertEqual((len(base), len(table)), (1, 2))
+        self.assertIn("http://schema.org/Thing", table)
+        self.assertNotIn("http://schema.org/Gene", base)
+
+    def test_preprocess_schema(self):
+        schema = {
+            "@context": {"schema": "http://schema.org/"},
+            "@graph": [
+                {"@id": "schema:Thing", "@type": "rdfs:Class", "rdfs:label": "Thing"},
+                {
+                    "@id": "schema:Person",
+                    "@type": "rdfs:Class",
+                    "rdfs:label": "Person",
+                    "rdfs:subClassOf": {"@id": "schema:Thing"},
+                },
+            ],
+        }
+        table = UriTable()
+        records = preprocess_schema(schema, uri_table=table)["@graph"]
+        self.assertEqual(list(table.uris), ["http://schema.org/Thing", "http://schema.org/Person"])
+        self.assertIs(records[1]["rdfs:subClassOf"]["@id"], records[0]["@id"])
+
+
 if __name__ == "__main__":
     unittest.main()
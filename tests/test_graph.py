@@ -0,0 +1,66 @@
+import unittest
+
+import networkx as nx
+
+from biothings_schema.graph import FrozenDiGraph, build_subgraph
+from biothings_schema.hierarchy import HierarchyIndex
+
+
+class TestFrozenDiGraph(unittest.TestCase):
+    """Test FrozenDiGraph Class"""
+
+    def setUp(self):
+        self.graph = nx.DiGraph()
+        self.graph.add_node("Thing", type="Class", description="The most generic type")
+        self.graph.add_edges_from(
+            [("Thing", "B"), ("Thing", "A"), ("A", "C"), ("B", "C"), ("C", "D"), ("Thing", "p")]
+        )
+        self.graph.nodes["p"]["type"] = "Property"
+        self.frozen = FrozenDiGraph.from_networkx(self.graph)
+
+    def test_nodes(self):
+        self.assertEqual(list(self.frozen), list(self.graph))
+        self.assertEqual(list(self.frozen.nodes()), list(self.graph.nodes()))
+        self.assertEqual(self.frozen.nodes(data=True), list(self.graph.nodes(data=True)))
+        self.assertEqual(len(self.frozen), 6)
+        self.assertIn("C", self.frozen)
+        self.assertNotIn("E", self.frozen.nodes)
+        # the attribute dicts are shared with the source graph
+        self.assertIs(self.frozen.nodes["Thing"], self.graph.nodes["Thing"])
+
+    def test_neighbors(self):
+        for node in self.graph:
+            self.assertEqual(list(self.frozen.successors(node)), list(self.graph.successors(node)))
+            self.assertEqual(
+                list(self.frozen.predecessors(node)), list(self.graph.predecessors(node))
+            )
+        self.assertEqual(self.frozen.edges(), list(self.graph.edges()))
+        self.assertEqual(self.frozen.number_of_edges(), 6)
+        with self.assertRaises(nx.NetworkXError):
+            self.frozen.successors("E")
+
+    def test_to_networkx(self):
+        graph = self.frozen.to_networkx()
+        self.assertEqual(list(graph.nodes(data=True)), list(self.graph.nodes(data=True)))
+        self.assertEqual(list(graph.edges()), list(self.graph.edges()))
+
+    def test_hierarchy(self):
+        index = HierarchyIndex(self.frozen)
+        self.assertEqual(index.topological_order, list(nx.topological_sort(self.graph)))
+        self.assertEqual(list(index.edge_bfs("A")), list(nx.edge_bfs(self.graph, "A")))
+        self.assertEqual(list(index.edge_bfs("Thing")), list(nx.edge_bfs(self.graph, "Thing")))
+        self.assertEqual(list(index.edge_bfs("E")), [])
+
+    def test_build_subgraph(self):
+        nodes = ["D", "C", "B", "A", "Thing"]
+        graph = self.graph.copy()
+        graph.add_edges_from(("Thing", f"p{i}") for i in range(10))
+        for backend in ("networkx", "frozen"):
+            subgraph = build_subgraph(graph, nodes, backend=backend)
+            # the node order follows the source graph, not the given nodes
+            self.assertEqual(list(subgraph), ["Thing", "B", "A", "C", "D"])
+            self.assertEqual(list(subgraph.successors("Thing")), ["B", "A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+
+import networkx as nx
+
+from biothings_schema.hierarchy import HierarchyIndex
+
+
+class TestHierarchyIndex(unittest.TestCase):
+    """Test HierarchyIndex Class"""
+
+    def setUp(self):
+        # Thing -> A -> C -> E, Thing -> B -> C, B -> D
+        self.graph = nx.DiGraph(
+            [("Thing", "A"), ("Thing", "B"), ("A", "C"), ("B", "C"), ("B", "D"), ("C", "E")]
+        )
+        self.graph.add_node("Orphan")
+        self.index = HierarchyIndex(self.graph, preferred_root="Thing")
+
+    def test_topological_order(self):
+        self.assertEqual(self.index.topological_order, list(nx.topological_sort(self.graph)))
+        with self.assertRaises(nx.NetworkXUnfeasible):
+            HierarchyIndex(nx.DiGraph([("A", "B"), ("B", "A")])).topological_order
+
+    def test_ordered_ancestors(self):
+        self.assertEqual(self.index.ordered_ancestors("E"), ["C", "A", "B", "Thing"])
+        self.assertEqual(self.index.ordered_ancestors("Thing"), [])
+
+    def test_cycle(self):
+        graph = nx.DiGraph([("Thing", "A"), ("A", "B"), ("B", "A"), ("Thing", "C")])
+        index = HierarchyIndex(graph, preferred_root="Thing")
+        # the ancestors/descendants queries don't need a DAG
+        self.assertEqual(index.ancestors("A"), nx.ancestors(graph, "A"))
+        self.assertEqual(index.descendants("A"), nx.descendants(graph, "A"))
+        self.assertEqual(index.descendants("Thing"), {"A", "B", "C"})
+        self.assertEqual(index.ancestors("C"), nx.ancestors(graph, "C"))
+        self.assertEqual(index.ordered_ancestors("A"), ["Thing", "B"])
+        self.assertTrue(index.is_descendant("A", "B"))
+        self.assertTrue(index.is_descendant("B", "A"))
+        self.assertFalse(index.is_descendant("C", "A"))
+        self.assertFalse(index.is_dag())
+        self.assertIsNone(index._descendant_intervals)
+        self.assertEqual(list(index.edge_bfs("B")), list(nx.edge_bfs(graph, "B")))
+        # the paths and the closure indexes do
+        with self.assertRaises(nx.NetworkXUnfeasible):
+            list(index.iter_paths("Thing", "C"))
+        with self.assertRaises(nx.NetworkXUnfeasible):
+            index.count_paths("Thing", "C")
+        for closure in ("bitset", "interval"):
+            with self.assertRaises(nx.NetworkXUnfeasible):
+                HierarchyIndex(graph, closure=closure)
+
+    def test_root(self):
+        self.assertEqual(self.index.root, "Thing")
+        self.assertEqual(self.index.roots, ["Thing", "Orphan"])
+        # fall back to the first node in topological order
+        self.assertEqual(HierarchyIndex(self.graph, preferred_root="X").root, "Thing")
+
+    def test_depth(self):
+        self.assertEqual(self.index.depth["Thing"], 0)
+        self.assertEqual(self.index.depth["D"], 2)
+        self.assertEqual(self.index.depth["E"], 3)
+        self.assertEqual(self.index.depth["Orphan"], 0)
+
+    def test_closure(self):
+        bitset_index = HierarchyIndex(self.graph, preferred_root="Thing", closure="bitset")
+        interval_index = HierarchyIndex(self.graph, preferred_root="Thing", closure="interval")
+        for index in (self.index, bitset_index, interval_index):
+            for node in self.graph:
+                self.assertEqual(index.ancestors(node), nx.ancestors(self.graph, node))
+                self.assertEqual(index.descendants(node), nx.descendants(self.graph, node))
+            self.assertTrue(index.is_descendant("E", "B"))
+            self.assertFalse(index.is_descendant("E", "D"))
+            self.assertFalse(index.is_descendant("E", "E"))
+            self.assertFalse(index.is_descendant("E", "Unknown"))
+        # the default index builds the descendant intervals on the first is_descendant call
+        self.assertIsNotNone(self.index._descendant_intervals)
+        self.assertIsNone(HierarchyIndex(self.graph)._descendant_intervals)
+        with self.assertRaises(ValueError):
+            HierarchyIndex(self.graph, closure="unknown")
+
+    def test_closure_random_dag(self):
+        graph = nx.gn_graph(300, seed=1).reverse()
+        graph.add_edges_from(
+            (parent, child) for parent, child in nx.gnp_random_graph(300, 0.01, seed=1).edges
+        )
+        for closure in HierarchyIndex.CLOSURE_INDEXES:
+            index = HierarchyIndex(graph, closure=closure)
+            for node in graph:
+                self.assertEqual(index.ancestors(node), nx.ancestors(graph, node))
+                self.assertEqual(index.descendants(node), nx.descendants(graph, node))
+                for other in index.ancestors(node):
+                    self.assertTrue(index.is_descendant(node, other))
+                    self.assertFalse(index.is_descendant(other, node))
+
+    def test_paths(self):
+        self.assertEqual(self.index.ancestors("E"), {"Thing", "A", "B", "C"})
+        paths = list(self.index.iter_paths("Thing", "E"))
+        self.assertEqual(paths, list(nx.all_simple_paths(self.graph, "Thing", "E")))
+        self.assertEqual(len(list(self.index.iter_paths("Thing", "E", max_paths=1))), 1)
+        self.assertEqual(list(self.index.iter_paths("Thing", "E", max_depth=2)), [])
+        self.assertEqual(len(list(self.index.iter_paths("Thing", "E", max_depth=3))), 2)
+        # no path has 0 edges, even to a child
+        self.assertEqual(list(self.index.iter_paths("Thing", "A", max_depth=0)), [])
+        self.assertEqual(list(self.index.iter_paths("Thing", "A", max_depth=1)), [["Thing", "A"]])
+        self.assertEqual(list(self.index.iter_paths("Thing", "Orphan")), [])
+        self.assertEqual(self.index.count_paths("Thing", "E"), 2)
+        self.assertEqual(self.index.count_paths("Thing", "Thing"), 0)
+        self.assertEqual(self.index.count_paths("Thing", "Orphan"), 0)
+
+    def test_path_count_grows_exponentially(self):
+        # a chain of "diamonds": 2 ** 30 paths from the root to the last node
+        graph = nx.DiGraph()
+        for i in range(30):
+            graph.add_edges_from(
+                [(i, ("L", i)), (i, ("R", i)), (("L", i), i + 1), (("R", i), i + 1)]
+            )
+        index = HierarchyIndex(graph)
+        self.assertEqual(index.count_paths(0, 30), 2**30)
+        self.assertEqual(len(list(index.iter_paths(0, 30, max_paths=10))), 10)
+
+    def test_ancestor_graph(self):
+        dag = self.index.ancestor_graph("E")
+        self.assertEqual(set(dag.nodes), {"Thing", "A", "B", "C", "E"})
+        self.assertEqual(
+            set(dag.edges),
+            {("Thing", "A"), ("Thing", "B"), ("A", "C"), ("B", "C"), ("C", "E")},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
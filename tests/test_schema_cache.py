@@ -0,0 +1,295 @@
+import gc
+import json
+import os
+import tempfile
+import unittest
+import warnings
+import weakref
+from unittest import mock
+
+import networkx as nx
+
+from biothings_schema import Schema, SchemaValidator, dataload
+from biothings_schema.dataload import (
+    BaseSchemaLoader,
+    ProcessedBaseSchema,
+    get_cached_schemaorg_versions,
+    get_dde_schema_digest,
+    get_schemaorg_version,
+    load_dde_schemas,
+    load_schema_into_networkx,
+    load_schemaorg,
+    registered_dde_schemas,
+)
+from biothings_schema.settings import DDE_SCHEMA_BASE_URL
+from biothings_schema.utils import FileCache
+
+MINI_SCHEMAORG = {
+    "@context": {
+        "schema": "http://schema.org/",
+        "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    },
+    "@graph": [
+        {
+            "@id": "schema:Thing",
+            "@type": "rdfs:Class",
+            "rdfs:comment": "The most generic type of item.",
+            "rdfs:label": "Thing",
+        }
+    ],
+}
+
+MINI_DDE = {
+    "@context": MINI_SCHEMAORG["@context"],
+    "@graph": [
+        {
+            "@id": "bts:Gene",
+            "@type": "rdfs:Class",
+            "rdfs:comment": "A gene",
+            "rdfs:label": "Gene",
+            "rdfs:subClassOf": {"@id": "schema:Thing"},
+        }
+    ],
+}
+
+
+def clear_memoized_schemas():
+    for func in (load_schemaorg, registered_dde_schemas, load_dde_schemas, get_dde_schema_digest):
+        func.cache_clear()
+
+
+class TestFileCache(unittest.TestCase):
+    """Test the on-disk FileCache"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = FileCache(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_set_and_get(self):
+        self.assertIsNone(self.cache.get("foo"))
+        path = self.cache.set("foo", b"bar")
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(self.cache.get("foo"), b"bar")
+        # overwriting a key should remove the previous entry
+        self.cache.set("foo", b"baz")
+        self.assertEqual(self.cache.get("foo"), b"baz")
+        self.assertEqual(self.cache.keys(), ["foo"])
+        # a key sharing the same prefix is a different entry
+        self.cache.set("foo.1", b"qux")
+        self.assertEqual(self.cache.get("foo"), b"baz")
+        self.assertEqual(self.cache.get("foo.1"), b"qux")
+
+    def test_corrupted_file_is_ignored(self):
+        path = self.cache.set("foo", b"bar")
+        with open(path, "wb") as f:
+            f.write(b"ba")
+        self.assertIsNone(self.cache.get("foo"))
+        self.assertFalse(os.path.exists(path))
+
+    def test_max_age(self):
+        path = self.cache.set("foo", b"bar")
+        os.utime(path, (0, 0))
+        self.assertIsNone(self.cache.get("foo", max_age=60))
+        self.assertEqual(self.cache.get("foo"), b"bar")
+
+    def test_evict(self):
+        cache = FileCache(self.tmp_dir.name, max_size=10)
+        path_1 = cache.set("one", b"123456")
+        os.utime(path_1, (0, 0))  # the least recently used
+        cache.set("two", b"123456")
+        self.assertIsNone(cache.get("one"))
+        self.assertEqual(cache.get("two"), b"123456")
+
+
+class TestSchemaorgCache(unittest.TestCase):
+    """Test loading schemaorg from the on-disk cache"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        FileCache(self.tmp_dir.name).set(
+            "schemaorg-1.0", json.dumps(MINI_SCHEMAORG).encode("utf-8")
+        )
+        clear_memoized_schemas()
+
+    def tearDown(self):
+        clear_memoized_schemas()
+        self.tmp_dir.cleanup()
+
+    def test_cached_versions(self):
+        self.assertEqual(get_cached_schemaorg_versions(self.tmp_dir.name), ["1.0"])
+        self.assertEqual(get_schemaorg_version(offline=True, cache_dir=self.tmp_dir.name), "1.0")
+
+    def test_load_schemaorg_offline(self):
+        data = load_schemaorg(version="1.0", cache_dir=self.tmp_dir.name, offline=True)
+        self.assertEqual(data, MINI_SCHEMAORG)
+        # not cached version should not be loaded in offline mode
+        with self.assertRaises(ValueError):
+            load_schemaorg(version="2.0", cache_dir=self.tmp_dir.name, offline=True)
+
+    def test_base_schema_loader_offline(self):
+        loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=True)
+        # "bts" is not a known DDE schema, it's ignored without a warning
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            base_schema = loader.load(base_schema=["schema.org", "bts"])
+        self.assertEqual(loader.schema_org_version, "1.0")
+        self.assertEqual(base_schema["@graph"], MINI_SCHEMAORG["@graph"])
+        # a registered DDE schema not in the cache cannot be loaded offline
+        FileCache(self.tmp_dir.name).set("dde-registry", json.dumps(["bts"]).encode("utf-8"))
+        clear_memoized_schemas()
+        loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=True)
+        with self.assertWarnsRegex(UserWarning, '"bts" is not available'):
+            loader.load(base_schema=["schema.org", "bts"])
+
+    def test_schema_validator_offline(self):
+        """Test the default base schema of SchemaValidator in the offline mode"""
+        loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=True)
+        schema = {"@context": MINI_SCHEMAORG["@context"], "@graph": []}
+        se = Schema(schema, base_schema=["schema.org"], base_schema_loader=loader)
+        with mock.patch.multiple(
+            dataload,
+            SCHEMAORG_OFFLINE=True,
+            SCHEMA_CACHE_DIR=self.tmp_dir.name,
+            load_json_or_yaml=mock.Mock(side_effect=AssertionError("network access")),
+        ):
+            # the default "bioschemas" base schema is not cached
+            with self.assertWarnsRegex(UserWarning, '"bioschemas" is not available'):
+                validator = SchemaValidator(schema, se)
+        self.assertEqual(validator.all_class_set, {"http://schema.org/Thing"})
+
+    def test_dde_schema_offline(self):
+        FileCache(self.tmp_dir.name).set("dde-bts", json.dumps(MINI_DDE).encode("utf-8"))
+        loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=True)
+        self.assertTrue(loader.is_a_dde_schema("bts"))
+        self.assertEqual(loader.load_dde_schemas("bts"), MINI_DDE)
+        # the cached DDE schema is part of the base schema identity
+        identity = loader.get_base_schema_identity(["schema.org", "bts"])
+        self.assertEqual(identity[0], "schema.org@1.0")
+        self.assertTrue(identity[1].startswith("bts@"))
+        base_schema = loader.load(base_schema=["schema.org", "bts"])
+        self.assertIn(MINI_DDE["@graph"][0], base_schema["@graph"])
+
+    def test_dde_schema_loaded_once(self):
+        """Test that DDE schemas are downloaded once, not once per BaseSchemaLoader"""
+        responses = {
+            DDE_SCHEMA_BASE_URL + "?field=_id&size=20": {"hits": [{"namespace": "bts"}]},
+            DDE_SCHEMA_BASE_URL + "bts": {"source": MINI_DDE},
+        }
+        fetch = mock.Mock(side_effect=responses.__getitem__)
+        processed = []
+        with mock.patch.object(dataload, "load_json_or_yaml", fetch):
+            for _ in range(2):
+                loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=False)
+                loader.schema_org_version = "1.0"
+                processed.append(loader.load_processed(base_schema=["schema.org", "bts"]))
+            self.assertIs(processed[0], processed[1])
+            self.assertEqual(fetch.call_count, 2)
+            # a new process reads them from the on-disk cache
+            clear_memoized_schemas()
+            loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=False)
+            loader.schema_org_version = "1.0"
+            self.assertIs(loader.load_processed(base_schema=["schema.org", "bts"]), processed[0])
+            self.assertEqual(fetch.call_count, 2)
+
+    def test_base_schema_snapshot(self):
+        loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=True)
+        processed = loader.load_processed(base_schema=["schema.org"])
+        self.assertEqual(processed.identity, ["schema.org@1.0"])
+        self.assertEqual(processed.class_uris, ["http://schema.org/Thing"])
+        snapshot_key = ProcessedBaseSchema.get_snapshot_key(processed.identity)
+        self.assertIn(snapshot_key, FileCache(self.tmp_dir.name).keys(suffix=".pickle"))
+        data = processed.to_snapshot()
+        schema, nodes = processed.schema, list(processed.graph.nodes(data=True))
+        # release it from the process-wide registry
+        del processed
+        gc.collect()
+
+        # the second load should come from the snapshot, without loading the raw schema
+        loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=True)
+        loader.load = None
+        snapshot = loader.load_processed(base_schema=["schema.org"])
+        self.assertEqual(snapshot.schema, schema)
+        self.assertEqual(list(snapshot.graph.nodes(data=True)), nodes)
+
+        # a snapshot for a different base schema identity is stale
+        self.assertIsNone(ProcessedBaseSchema.from_snapshot(data, identity=["schema.org@2.0"]))
+
+        # the snapshot of a new schemaorg version replaces the superseded one
+        FileCache(self.tmp_dir.name).set(
+            "schemaorg-2.0", json.dumps(MINI_SCHEMAORG).encode("utf-8")
+        )
+        loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=True)
+        processed = loader.load_processed(base_schema=["schema.org"])
+        self.assertEqual(processed.identity, ["schema.org@2.0"])
+        self.assertEqual(FileCache(self.tmp_dir.name).keys(suffix=".pickle"), [snapshot_key])
+        self.assertIsNone(ProcessedBaseSchema.from_snapshot(b"invalid", identity=snapshot.identity))
+
+    def test_shared_base_schema(self):
+        loader = BaseSchemaLoader(cache_dir=self.tmp_dir.name, offline=True, use_snapshot=False)
+        se_1 = Schema(base_schema=["schema.org"], base_schema_loader=loader)
+        se_2 = Schema(base_schema=["schema.org"], base_schema_loader=loader)
+        # the processed base schema is built once and shared by both Schema instances
+        self.assertIs(se_1.base_schema_nx, se_2.base_schema_nx)
+        self.assertIs(se_1.base_schema, se_2.base_schema)
+        self.assertTrue(nx.is_frozen(se_1.base_schema_nx))
+        # so is the set of classes used by the validators
+        self.assertIs(se_1.validator.all_class_set, se_1._processed_base_schema.class_set)
+        self.assertIs(se_1.validator.all_class_set, se_2.validator.all_class_set)
+        self.assertIn("http://schema.org/Thing", se_1.validator.all_class_set)
+        processed = weakref.ref(se_1._processed_base_schema)
+        del se_1, se_2
+        gc.collect()
+        self.assertIsNone(processed())
+
+
+class TestLoadSchemaIntoNetworkx(unittest.TestCase):
+    """Test building the schema graph"""
+
+    def test_property_records_are_shared(self):
+        schema = {
+            "@context": {},
+            "@graph": [
+                {
+                    "@id": "http://schema.org/Thing",
+                    "@type": "rdfs:Class",
+                    "rdfs:comment": "The most generic type of item.",
+                },
+                {
+                    "@id": "http://schema.org/knows",
+                    "@type": "rdf:Property",
+                    "rdfs:comment": "A person known by this person.",
+                    "http://schema.org/domainIncludes": [
+                        {"@id": "http://schema.org/Person"},
+                        {"@id": "http://schema.org/Thing"},
+                    ],
+                    "http://schema.org/rangeIncludes": {"@id": "http://schema.org/Person"},
+                },
+            ],
+        }
+        G = load_schema_into_networkx(schema)
+        person = G.nodes["http://schema.org/Person"]
+        thing = G.nodes["http://schema.org/Thing"]
+        self.assertEqual(
+            person["properties"][0],
+            {
+                "description": "A person known by this person.",
+                "domain": ["http://schema.org/Person", "http://schema.org/Thing"],
+                "range": ["http://schema.org/Person"],
+                "inverse": None,
+                "uri": "http://schema.org/knows",
+            },
+        )
+        self.assertEqual(thing["description"], "The most generic type of item.")
+        # a single record per property, referenced from every domain and range class
+        self.assertIs(person["properties"][0], thing["properties"][0])
+        self.assertIs(person["properties"][0], person["used_by"][0])
+        self.assertIs(
+            person["properties"][0]["domain"], G.nodes["http://schema.org/knows"]["domain"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,19 @@
+import os
 import unittest
 
 from biothings_schema import Schema, SchemaClass, SchemaProperty
+from biothings_schema.dataload import load_json_or_yaml
+from biothings_schema.graph import FrozenDiGraph
+
+_CURRENT = os.path.abspath(os.path.dirname(__file__))
 
 
 class TestSchemaClass(unittest.TestCase):
     """Test Schema Validator Class"""
 
     def setUp(self):
-        schema_url = "https://raw.githubusercontent.com/data2health/schemas/biothings/biothings/biothings_curie_kevin.jsonld"
-        self.se = Schema(schema_url)
+        self.schema_url = "https://raw.githubusercontent.com/data2health/schemas/biothings/biothings/biothings_curie_kevin.jsonld"
+        self.se = Schema(self.schema_url)
 
     def test_list_all_classes(self):
         """Test list_all_classes function"""
@@ -48,6 +53,245 @@ class TestSchemaClass(unittest.TestCase):
         sp = self.se.get_property("ensembl")
         self.assertEqual(SchemaProperty, type(sp))
 
+    def test_instances_are_cached(self):
+        """Test SchemaClass/SchemaProperty instances are shared"""
+        scls = self.se.get_class("bts:Gene")
+        self.assertIs(self.se.get_class("http://schema.biothings.io/Gene"), scls)
+        self.assertIn(scls, self.se.get_class("Gene"))
+        self.assertIs(SchemaClass("bts:Gene", self.se), scls)
+        self.assertIsNot(self.se.get_class("bts:Gene", output_type="uri"), scls)
+        self.assertIs(self.se.get_property("ensembl"), self.se.get_property("bts:ensembl"))
+        self.assertFalse(hasattr(scls, "__dict__"))
+        # undefined classes are not cached, a warning is raised each time
+        with self.assertWarns(UserWarning):
+            self.se.get_class("bts:ffff")
+        with self.assertWarns(UserWarning):
+            self.se.get_class("bts:ffff")
+
+    def test_frozen_graph_backend(self):
+        """Test the frozen graph backend gives the same results"""
+        se = Schema(self.schema_url, graph_backend="frozen")
+        # compare the repr, the SchemaProperty objects of different Schemas are not equal
+        for class_name in ("bts:Gene", "schema:Thing", "bts:MolecularEntity"):
+            for output_type in ("curie", "uri"):
+                self.assertEqual(
+                    repr(se.get_class(class_name, output_type=output_type).describe()),
+                    repr(self.se.get_class(class_name, output_type=output_type).describe()),
+                )
+        self.assertEqual(
+            repr(se.get_property("ensembl", output_type="curie").describe()),
+            repr(self.se.get_property("ensembl", output_type="curie").describe()),
+        )
+        # the full schema graph is frozen too, and still used by the validator
+        self.assertIsInstance(se.full_schema_nx, FrozenDiGraph)
+        self.assertIs(se.validator.schema_nx, se.full_schema_nx)
+        gene = "http://schema.biothings.io/Gene"
+        self.assertEqual(
+            se.validator.get_root_path_classes(gene),
+            self.se.validator.get_root_path_classes(gene),
+        )
+        with self.assertRaises(ValueError):
+            Schema(self.schema_url, graph_backend="unknown")
+
+    def test_is_subclass_of(self):
+        """Test is_subclass_of and is_subproperty_of functions"""
+        for closure_index in (None, "interval", "bitset"):
+            se = self.se
+            if closure_index:
+                se = Schema(self.schema_url, closure_index=closure_index)
+            self.assertTrue(se.is_subclass_of("bts:Gene", "schema:Thing"))
+            self.assertTrue(se.is_subclass_of("Gene", "http://schema.biothings.io/MolecularEntity"))
+            self.assertTrue(se.is_subclass_of("Gene", "Gene"))
+            self.assertFalse(se.is_subclass_of("schema:Thing", "bts:Gene"))
+            self.assertFalse(se.is_subclass_of("bts:ffff", "bts:ffff"))
+            self.assertEqual(
+                se.is_subclass_of_many([("Gene", "Thing"), ("Thing", "Gene")]), [True, False]
+            )
+            self.assertTrue(se.is_subproperty_of("ensembl", "ensembl"))
+            self.assertFalse(se.is_subproperty_of("ensembl", "bts:ffff"))
+
+    def test_cyclic_schema(self):
+        """Test the hierarchy queries on a user schema with a subClassOf cycle"""
+        schema = {
+            "@context": {"schema": "http://schema.org/", "ex": "http://example.org/"},
+            "@graph": [
+                {
+                    "@id": "ex:A",
+                    "@type": "rdfs:Class",
+                    "rdfs:comment": "A class",
+                    "rdfs:label": "A",
+                    "rdfs:subClassOf": [{"@id": "schema:Thing"}, {"@id": "ex:B"}],
+                },
+                {
+                    "@id": "ex:B",
+                    "@type": "rdfs:Class",
+                    "rdfs:comment": "B class",
+                    "rdfs:label": "B",
+                    "rdfs:subClassOf": {"@id": "ex:A"},
+                },
+            ],
+        }
+        se = Schema(schema)
+        self.assertEqual(
+            sorted(se.get_class("ex:A", output_type="curie").ancestor_classes),
+            ["ex:B", "schema:Thing"],
+        )
+        self.assertEqual(
+            sorted(se.get_class("ex:B", output_type="curie").ancestor_classes),
+            ["ex:A", "schema:Thing"],
+        )
+        self.assertIn("ex:B", se.get_class("schema:Thing", output_type="curie").descendant_classes)
+        self.assertEqual(se.get_class("schema:Thing", output_type="curie").ancestor_classes, [])
+        self.assertTrue(se.is_subclass_of("ex:B", "ex:A"))
+        self.assertTrue(se.is_subclass_of("ex:A", "ex:B"))
+        self.assertTrue(se.is_subclass_of("ex:A", "ex:A"))
+        self.assertTrue(se.is_subproperty_of("schema:name", "schema:name"))
+        for class_specific in (True, False):
+            groups = se.get_class("ex:A", output_type="curie").list_properties(
+                class_specific=class_specific
+            )
+            self.assertEqual(groups[0]["class"], "ex:A")
+        self.assertEqual(
+            [_group["class"] for _group in groups], ["ex:A", "schema:Thing", "ex:B"]
+        )
+
+    def test_hash_namespace(self):
+        """Test a user schema with a namespace ending with "#" """
+        schema = {
+            "@context": {"schema": "http://schema.org/", "ex": "http://example.org/vocab#"},
+            "@graph": [
+                {
+                    "@id": "ex:Foo",
+                    "@type": "rdfs:Class",
+                    "rdfs:comment": "Foo class",
+                    "rdfs:label": "Foo",
+                    "rdfs:subClassOf": {"@id": "schema:Thing"},
+                },
+                {
+                    "@id": "ex:Bar",
+                    "@type": "rdfs:Class",
+                    "rdfs:comment": "Bar class",
+                    "rdfs:label": "Bar",
+                    "rdfs:subClassOf": {"@id": "ex:Foo"},
+                },
+            ],
+        }
+        se = Schema(schema)
+        self.assertEqual(se.cls_converter.get_uri("ex:Bar"), "http://example.org/vocab#Bar")
+        self.assertEqual(se.cls_converter.get_curie("http://example.org/vocab#Bar"), "ex:Bar")
+        scls = se.get_class("ex:Bar", output_type="curie")
+        self.assertTrue(scls.defined_in_schema)
+        self.assertEqual(scls.uri, "http://example.org/vocab#Bar")
+        self.assertEqual(scls.parent_classes, [["schema:Thing", "ex:Foo"]])
+        self.assertTrue(se.is_subclass_of("ex:Bar", "ex:Foo"))
+
+    def test_inherited_properties(self):
+        """Test the order of the classes in list_properties(class_specific=False)"""
+        se = Schema(
+            load_json_or_yaml(
+                os.path.join(_CURRENT, "data", "mock_multi-inheritance_schema.jsonld")
+            )
+        )
+        scls = se.get_class("http://example.org/Class_A", output_type="curie")
+        # the class specific properties don't need the inherited properties index
+        self.assertEqual(
+            [_group["class"] for _group in scls.list_properties()], ["example:Class_A"]
+        )
+        self.assertIsNone(se._inherited_properties)
+        # the direct parents come before the root class
+        classes = [_group["class"] for _group in scls.list_properties(class_specific=False)]
+        self.assertEqual(classes[0], "example:Class_A")
+        self.assertEqual(sorted(classes[1:3]), ["example:Class_A0", "example:Class_A1"])
+        self.assertEqual(classes[3:], ["schema:Thing"])
+
+    def test_update_context(self):
+        """Test the property records after changing the context"""
+        se = Schema(
+            load_json_or_yaml(
+                os.path.join(_CURRENT, "data", "mock_multi-inheritance_schema.jsonld")
+            )
+        )
+        scls = se.get_class("http://example.org/Class_A", output_type="curie")
+        [f3] = scls.list_properties()[0]["properties"]
+        self.assertEqual((f3["curie"], f3["domain"]), ("example:f3", ["example:Class_A"]))
+        se.update_context({"zz": "http://example.org/"})
+        scls = se.get_class("http://example.org/Class_A", output_type="curie")
+        [f3] = scls.list_properties()[0]["properties"]
+        self.assertEqual((f3["curie"], f3["domain"]), ("zz:f3", ["zz:Class_A"]))
+        groups = scls.list_properties(class_specific=False)
+        self.assertEqual([_group["class"] for _group in groups][0], "zz:Class_A")
+        self.assertEqual(groups[0]["properties"][0]["curie"], "zz:f3")
+
+    def test_redefined_property_records(self):
+        """Test the property records of a base property redefined by the user schema"""
+        schema = {
+            "@context": {"schema": "http://schema.org/", "ex": "http://example.org/"},
+            "@graph": [
+                {
+                    "@id": "ex:My",
+                    "@type": "rdfs:Class",
+                    "rdfs:comment": "My class",
+                    "rdfs:label": "My",
+                    "rdfs:subClassOf": {"@id": "schema:Thing"},
+                },
+                {
+                    "@id": "schema:name",
+                    "@type": "rdf:Property",
+                    "rdfs:comment": "My name",
+                    "rdfs:label": "name",
+                    "schema:domainIncludes": {"@id": "ex:My"},
+                    "schema:rangeIncludes": {"@id": "schema:Text"},
+                },
+            ],
+        }
+        se = Schema(schema)
+        [group] = se.get_class("ex:My", output_type="curie").list_properties()
+        [name] = [_prop for _prop in group["properties"] if _prop["label"] == "name"]
+        self.assertEqual((name["description"], name["domain"]), ("My name", ["ex:My"]))
+        # the base schema record of Thing is not mixed up with the user schema one
+        [group] = se.get_class("schema:Thing", output_type="curie").list_properties()
+        [name] = [_prop for _prop in group["properties"] if _prop["label"] == "name"]
+        self.assertNotEqual(name["description"], "My name")
+        self.assertIn("schema:Thing", name["domain"])
+
+    def test_property_records_are_copied(self):
+        """Test that the uri output does not expose the shared property records"""
+        gene = self.se.get_class("bts:Gene", output_type="uri")
+        for get_records in (lambda: gene.list_properties()[0]["properties"], gene.used_by):
+            records = get_records()
+            self.assertTrue(records)
+            records[0]["domain"].append("http://example.org/Unknown")
+            records[0]["description"] = "modified"
+            self.assertNotIn("http://example.org/Unknown", get_records()[0]["domain"])
+            self.assertNotEqual(get_records()[0]["description"], "modified")
+
+    def test_used_by_many(self):
+        """Test used_by_many function"""
+        gene = self.se.get_class("bts:Gene", output_type="uri")
+        direct = {_prop["uri"] for _prop in gene.used_by()}
+        # the properties accepting Gene or any of its ancestors
+        expected = set(direct)
+        for _ancestor in gene.ancestor_classes:
+            expected.update(
+                _prop["uri"] for _prop in self.se.get_class(_ancestor, output_type="uri").used_by()
+            )
+        inherited = [_prop["uri"] for _prop in gene.used_by(inherited=True)]
+        self.assertEqual(len(inherited), len(set(inherited)))
+        self.assertEqual(set(inherited), expected)
+        self.assertTrue(expected > direct)
+        self.assertEqual(
+            [
+                {_prop["uri"] for _prop in _props}
+                for _props in self.se.used_by_many(
+                    ["bts:Gene", "bts:ffff"], inherited=False, output_type="uri"
+                )
+            ],
+            [direct, set()],
+        )
+        [props] = self.se.used_by_many(["http://schema.biothings.io/Gene"], output_type="curie")
+        self.assertEqual({_prop["uri"] for _prop in props}, expected)
+        self.assertEqual(props, self.se.get_class("bts:Gene", output_type="curie").used_by(True))
+
 
 if __name__ == "__main__":
     unittest.main()
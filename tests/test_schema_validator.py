@@ -1,3 +1,4 @@
+import copy
 import os
 import sys
 import unittest
@@ -160,6 +161,35 @@ class TestSchemaValidator(unittest.TestCase):
 
         self.sv.validation_errors = []  # reset validation error list
 
+    def test_get_label_domains(self):
+        """Test the label index used by validate_validation_field"""
+        [record] = self.sv.records_by_label["ensembl"]
+        self.assertEqual(record["@id"], "http://schema.biothings.io/ensembl")
+        self.assertEqual(
+            self.sv.get_label_domains("ensembl"),
+            frozenset(["http://schema.biothings.io/Transcript"]),
+        )
+        self.assertEqual(self.sv.get_label_domains("kkk"), frozenset())
+
+    def test_get_root_path_classes(self):
+        """Test get_root_path_classes on a multi-inheritance hierarchy"""
+        validator = Schema(self.mock_schema).validator
+        self.assertEqual(
+            validator.get_root_path_classes("http://example.org/Class_A"),
+            {
+                "http://schema.org/Thing",
+                "http://example.org/Class_A0",
+                "http://example.org/Class_A1",
+                "http://example.org/Class_A",
+            },
+        )
+        self.assertEqual(
+            validator.get_root_path_classes("http://schema.org/Thing"),
+            {"http://schema.org/Thing"},
+        )
+        # a property has no path to the root class
+        self.assertEqual(validator.get_root_path_classes("http://example.org/f1"), set())
+
     def test_check_whether_atid_and_label_match(self):
         """Test check_whether_atid_and_label_match function"""
         test_case_fail = {"@id": "bts:Gene", "rdfs:label": "Variant"}
@@ -406,6 +436,30 @@ class TestSchemaValidator(unittest.TestCase):
                 f"Required field '{req_field}' not found in properties",
             )
 
+    def test_merge_lists(self):
+        """Test _merge_lists deduplication and ordering"""
+        self.assertEqual(self.sv._merge_lists(["b", "a"], ["a", "c", "b"]), ["b", "a", "c"])
+        left = [{"type": "string", "enum": ["a", "b"]}, {"type": "number"}]
+        right = [{"enum": ["a", "b"], "type": "string"}, 1, True, 1.0, {"type": "number"}, 1]
+        merged = self.sv._merge_lists(left, right)
+        # dicts are compared structurally, 1, True and 1.0 are different JSON values
+        self.assertEqual(merged, left + [1, True, 1.0])
+        self.assertIs(merged[0], left[0])
+        self.assertEqual([type(x) for x in merged[2:]], [int, bool, float])
+
+    def test_merge_all_recursive_parents(self):
+        """Test that merging all classes at once matches merge_recursive_parents"""
+        nested_schema = load_json_or_yaml(os.path.join(_CURRENT, "data", "nested_schema.json"))
+        for schema in (self.mock_schema, nested_schema):
+            expected_sv = SchemaValidator(copy.deepcopy(schema), None)
+            graph = self._get_graph(expected_sv)
+            for idx, record in enumerate(graph):
+                if record["@type"] == "rdfs:Class":
+                    expected_sv.merge_recursive_parents(record, idx)
+            sv = SchemaValidator(copy.deepcopy(schema), None)
+            sv.merge_all_recursive_parents()
+            self.assertEqual(self._get_graph(sv), graph)
+
     def _get_graph(self, sv):
         return sv.extension_schema.get("schema", {}).get("@graph") or sv.extension_schema.get("@graph")
 
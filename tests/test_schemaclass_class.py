@@ -209,6 +209,28 @@ class TestSchemaClassClass(unittest.TestCase):
         usage = scls.used_by()
         self.assertEqual(usage, [])
 
+    def test_list_properties(self):
+        """Test list_properties function"""
+        scls = self.se.get_class("bts:Gene", output_type="curie")
+        properties = scls.list_properties(class_specific=False)
+        classes = [_item["class"] for _item in properties]
+        self.assertEqual(classes[0], "bts:Gene")
+        self.assertEqual(sorted(classes[1:]), sorted(scls.ancestor_classes))
+        # the inherited properties come from the precomputed index
+        groups = self.se.inherited_properties[scls.uri]
+        self.assertEqual(
+            [len(_item["properties"]) for _item in properties],
+            [len(_properties) for _, _properties in groups],
+        )
+        self.assertEqual(scls.list_properties(), properties[:1])
+        # each call returns new records
+        again = scls.list_properties()
+        self.assertEqual(again, properties[:1])
+        self.assertIsNot(again[0]["properties"][0], properties[0]["properties"][0])
+        # test if class is not defined
+        scls = self.se.get_class("dd")
+        self.assertEqual(scls.list_properties(), [])
+
     def test_describe(self):
         """test describe function"""
         scls = self.se.get_class("dd")
@@ -1,13 +1,20 @@
 """timing a schema parsing"""
+import copy
+import os
 from time import time
 
+import networkx as nx
+
 from biothings_schema import Schema
+from biothings_schema.dataload import load_json_or_yaml
+
+BTS_URL = "https://raw.githubusercontent.com/data2health/schemas/biothings/biothings/biothings_curie_kevin.jsonld"
 
 
 def timeit():
     """timing a schema parsing"""
     start = time()
-    bts_url = "https://raw.githubusercontent.com/data2health/schemas/biothings/biothings/biothings_curie_kevin.jsonld"
+    bts_url = BTS_URL
     bts_se = Schema(bts_url)
     clses = bts_se.list_all_classes()
     for _cls in clses:
@@ -28,5 +35,82 @@ def timeit():
     print(end - start)
 
 
+def time_describe(schema=BTS_URL, include_base=True):
+    """timing describe() over all classes of a schema"""
+    se = Schema(schema)
+    clses = se.list_all_classes(include_base=include_base)
+    start = time()
+    for _cls in clses:
+        _cls.describe()
+    end = time()
+    print(f"describe() on {len(clses)} classes: {end - start:.2f}s")
+
+
+def time_graph_traversal(schema=BTS_URL, repeat=10):
+    """timing traversals on subgraph views vs materialized graphs"""
+    se = Schema(schema)
+    class_nodes = [
+        node
+        for node, attrdict in se.full_schema_nx.nodes(data=True)
+        if attrdict.get("type") == "Class"
+    ]
+    view = se.full_schema_nx.subgraph(class_nodes)
+    for name, graph in [("subgraph view", view), ("materialized graph", view.copy())]:
+        start = time()
+        for _ in range(repeat):
+            for node in graph:
+                list(graph.successors(node))
+                list(graph.predecessors(node))
+                graph.nodes[node].get("description")
+            for node in class_nodes[:: max(1, len(class_nodes) // 20)]:
+                nx.ancestors(graph, node)
+        end = time()
+        print(f"{name}: {end - start:.2f}s")
+
+
+def scale_multi_inheritance_schema(levels=20, width=2):
+    """Scale up tests/data/mock_multi-inheritance_schema.jsonld: each level has width
+    classes, subclasses of all the classes of the previous level, so the number of
+    paths from the root class doubles (for width=2) with each level.
+    Each class has a $validation field using a property of the first level classes.
+    """
+    mock = load_json_or_yaml(
+        os.path.join(os.path.dirname(__file__), "data", "mock_multi-inheritance_schema.jsonld")
+    )
+    records = {_record["@id"]: _record for _record in mock["@graph"]}
+    schema = {"@context": mock["@context"], "@graph": [records["schema:Thing"]]}
+    parents = ["schema:Thing"]
+    f1 = copy.deepcopy(records["example:f1"])
+    for level in range(levels):
+        classes = [f"example:Class_{level}_{idx}" for idx in range(width)]
+        for _class in classes:
+            _record = copy.deepcopy(records["example:Class_A"])
+            _record["@id"] = _class
+            _record["rdfs:label"] = _class.split(":")[1]
+            _record["rdfs:subClassOf"] = [{"@id": _parent} for _parent in parents]
+            _record["$validation"]["properties"] = {"f1": {"type": "string"}}
+            _record["$validation"]["required"] = ["f1"]
+            schema["@graph"].append(_record)
+        if not level:
+            f1["schema:domainIncludes"] = [{"@id": _class} for _class in classes]
+        parents = classes
+    schema["@graph"].append(f1)
+    return schema
+
+
+def time_multi_inheritance_validation(levels=20, width=2, validation_merge=False):
+    """timing the validation of a scaled up multi-inheritance schema"""
+    schema = scale_multi_inheritance_schema(int(levels), int(width))
+    validation_merge = validation_merge in (True, "True", "1")
+    start = time()
+    Schema(schema, validator_options={"validation_merge": validation_merge})
+    end = time()
+    print(
+        f"validating {levels} levels of {width} classes "
+        f"(validation_merge={validation_merge}): {end - start:.2f}s"
+    )
+
+
 if __name__ == "__main__":
     timeit()
+    time_describe()